@@ -0,0 +1,75 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    "mysql+pymysql://root:@localhost:3306/event_management"
+)
+
+# Async driver for the async routers: aiomysql in production, aiosqlite for
+# local SQLite databases. Derived from DATABASE_URL unless set explicitly.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    DATABASE_URL
+    .replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    .replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+# Connection pool, sized per uvicorn worker
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# Password hashing runs in a process pool. HASH_WORKERS=0 falls back to the
+# default thread pool (handy for local development).
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "64"))
+HASH_ROUNDS = int(os.getenv("HASH_ROUNDS", "29000"))
+
+# Seconds between expired-membership sweeps in each worker (0 disables)
+MEMBERSHIP_SWEEP_INTERVAL = float(os.getenv("MEMBERSHIP_SWEEP_INTERVAL", "3600"))
+
+# Add-to-cart stock holds: lifetime and seconds between expired-hold sweeps
+RESERVATION_TTL_SECONDS = int(os.getenv("RESERVATION_TTL_SECONDS", "900"))
+RESERVATION_SWEEP_INTERVAL = float(os.getenv("RESERVATION_SWEEP_INTERVAL", "60"))
+
+# Checkout Idempotency-Key retention and seconds between purges of expired keys
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_PURGE_INTERVAL = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "3600"))
+
+# Order event outbox, drained by outbox_worker.py
+OUTBOX_SINK = os.getenv("OUTBOX_SINK", "file")  # "webhook", "file" or "memory"
+OUTBOX_WEBHOOK_URL = os.getenv("OUTBOX_WEBHOOK_URL", "")
+OUTBOX_FILE_PATH = os.getenv("OUTBOX_FILE_PATH", "outbox_events.ndjson")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+OUTBOX_RETRY_BASE = float(os.getenv("OUTBOX_RETRY_BASE", "5"))
+OUTBOX_RETRY_MAX = float(os.getenv("OUTBOX_RETRY_MAX", "3600"))
+
+# /vendor/stream: seconds between outbox polls (other workers' events),
+# how long an outbox id gap is waited on before it is taken for a rollback,
+# keep-alive comment interval and the client reconnect delay
+EVENT_STREAM_POLL_INTERVAL = float(os.getenv("EVENT_STREAM_POLL_INTERVAL", "1"))
+EVENT_STREAM_GAP_GRACE = float(os.getenv("EVENT_STREAM_GAP_GRACE", "30"))
+EVENT_STREAM_KEEPALIVE = float(os.getenv("EVENT_STREAM_KEEPALIVE", "15"))
+EVENT_STREAM_RETRY_MS = int(os.getenv("EVENT_STREAM_RETRY_MS", "3000"))
+
+# Token-bucket rate limits as "<requests>/<seconds>"
+RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", True)
+RATE_LIMIT_TRUST_FORWARDED = _env_bool("RATE_LIMIT_TRUST_FORWARDED", False)
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+RATE_LIMIT_SIGNUP = os.getenv("RATE_LIMIT_SIGNUP", "5/60")
+RATE_LIMIT_CART = os.getenv("RATE_LIMIT_CART", "60/60")
+RATE_LIMIT_CHECKOUT = os.getenv("RATE_LIMIT_CHECKOUT", "10/60")
+
+# Per-route latency and DB query metrics at /metrics (Prometheus text format)
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
@@ -1,9 +1,48 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "mysql+pymysql://root:@localhost:3306/event_management"
+from app import config
+from app.utils.pool_metrics import (
+    MeteredQueuePool,
+    MeteredAsyncQueuePool,
+    attach_pool_metrics,
+    async_pool_metrics
+)
+
+DATABASE_URL = config.DATABASE_URL
+ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL
+
+
+def _pool_options(poolclass):
+    return {
+        "poolclass": poolclass,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING
+    }
+
+
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+else:
+    engine = create_engine(DATABASE_URL, **_pool_options(MeteredQueuePool))
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **_pool_options(MeteredAsyncQueuePool)
+    )
 
-engine = create_engine(DATABASE_URL)
+attach_pool_metrics(engine)
+attach_pool_metrics(async_engine.sync_engine, async_pool_metrics)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -11,4 +50,28 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
-Base = declarative_base()
\ No newline at end of file
+# expire_on_commit=False: async sessions cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+Base = declarative_base()
+
+
+# Request-scoped session. FastAPI caches dependencies per request, so the
+# auth dependencies and the route handler all share this one session.
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async counterpart of get_db for the async routers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,21 +1,15 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.models.user import User
 from app.utils.token import verify_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def get_current_user(token: str = Depends(oauth2_scheme),
                      db: Session = Depends(get_db)):
 
@@ -26,6 +20,29 @@ def get_current_user(token: str = Depends(oauth2_scheme),
 
     user = db.query(User).filter(User.id == payload.get("user_id")).first()
 
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Hand the connection back before the route runs. The route body is a
+    # separate threadpool call, and holding a pooled connection while waiting
+    # for a free thread deadlocks the pool under load. The user stays loaded.
+    db.expunge(user)
+    db.rollback()
+
+    return user
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme),
+                                 db: AsyncSession = Depends(get_async_db)):
+
+    payload = verify_token(token)
+
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    result = await db.execute(select(User).where(User.id == payload.get("user_id")))
+    user = result.scalars().first()
+
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
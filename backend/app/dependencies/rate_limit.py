@@ -0,0 +1,50 @@
+import math
+
+from fastapi import HTTPException, Request
+
+from app import config
+from app.utils import rate_limit as buckets
+from app.utils.token import verify_token
+
+
+def client_ip(request: Request) -> str:
+    if config.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def client_key(request: Request, key_by: str) -> str:
+    # The JWT is decoded locally, so keying by user never touches the database;
+    # requests without a valid token fall back to their IP.
+    if key_by == "user":
+        auth = request.headers.get("authorization", "")
+        if auth.lower().startswith("bearer "):
+            payload = verify_token(auth[7:])
+            if payload and payload.get("user_id") is not None:
+                return f"user:{payload['user_id']}"
+    return f"ip:{client_ip(request)}"
+
+
+# Token-bucket limit for a route. Attach it through the route's
+# dependencies=[...] so it runs before the auth and database dependencies.
+def rate_limit(policy: str, limit: str, key_by: str = "user"):
+    capacity, seconds = buckets.parse_limit(limit)
+    rate = capacity / seconds
+
+    def limiter(request: Request):
+        if not config.RATE_LIMIT_ENABLED:
+            return
+
+        allowed, retry_after = buckets.store.take(
+            f"{policy}:{client_key(request, key_by)}", capacity, rate
+        )
+
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+    return limiter
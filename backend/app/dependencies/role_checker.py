@@ -1,5 +1,5 @@
 from fastapi import Depends, HTTPException
-from app.dependencies.auth_dependency import get_current_user
+from app.dependencies.auth_dependency import get_current_user, get_current_user_async
 
 
 def require_role(required_role: str):
@@ -7,4 +7,13 @@ def require_role(required_role: str):
         if current_user.role != required_role:
             raise HTTPException(status_code=403, detail="Access denied")
         return current_user
+    return role_checker
+
+
+# Same check for async routes, sharing the request's AsyncSession
+def require_role_async(required_role: str):
+    async def role_checker(current_user = Depends(get_current_user_async)):
+        if current_user.role != required_role:
+            raise HTTPException(status_code=403, detail="Access denied")
+        return current_user
     return role_checker
\ No newline at end of file
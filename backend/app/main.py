@@ -1,9 +1,14 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.database import engine, async_engine
+from app.migrations import check_schema_version
 from app.models import user, membership, product, cart, order
 from sqlalchemy import text
-from app.database import SessionLocal
+from sqlalchemy.orm import Session
+from app.database import get_db
 from app.routers import auth
 from app.routers import test_protected
 from app.routers import admin
@@ -12,10 +17,54 @@ from app.routers import user
 from app.routers import guest
 from app.routers import cart
 from app.routers import order
-
-
-
-app = FastAPI()
+from app import config
+from app.utils.security import password_hasher
+from app.utils.periodic import run_periodically
+from app.utils.memberships import sweep_expired_memberships
+from app.utils.reservations import sweep_expired_reservations
+from app.utils.idempotency import sweep_expired_idempotency_keys
+from app.utils.event_stream import event_broker
+from app.utils.metrics import metrics, instrument_engine, MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_schema_version(engine)
+    password_hasher.start()
+
+    tasks = [asyncio.create_task(event_broker.run())]
+    if config.MEMBERSHIP_SWEEP_INTERVAL > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            "Membership sweep",
+            sweep_expired_memberships,
+            config.MEMBERSHIP_SWEEP_INTERVAL
+        )))
+    if config.RESERVATION_SWEEP_INTERVAL > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            "Reservation sweep",
+            sweep_expired_reservations,
+            config.RESERVATION_SWEEP_INTERVAL
+        )))
+    if config.IDEMPOTENCY_PURGE_INTERVAL > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            "Idempotency key purge",
+            sweep_expired_idempotency_keys,
+            config.IDEMPOTENCY_PURGE_INTERVAL
+        )))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if config.METRICS_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,37 +74,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine)
-
-# Startup Migration for Orders Table
-with engine.connect() as conn:
-    order_columns = [
-        ("name", "VARCHAR(100)"),
-        ("email", "VARCHAR(150)"),
-        ("address", "VARCHAR(255)"),
-        ("city", "VARCHAR(100)"),
-        ("state", "VARCHAR(100)"),
-        ("pincode", "VARCHAR(20)"),
-        ("phone", "VARCHAR(20)"),
-        ("payment_method", "VARCHAR(50)")
-    ]
-    for col_name, col_type in order_columns:
-        try:
-            conn.execute(text(f"ALTER TABLE orders ADD COLUMN {col_name} {col_type}"))
-            conn.commit()
-            print(f"Migration: Added column {col_name} to orders table")
-        except Exception:
-            # Column likely exists
-            pass
-            
-    # Migration for User Table: Adding image_url
-    try:
-        conn.execute(text("ALTER TABLE users ADD COLUMN image_url VARCHAR(255)"))
-        conn.commit()
-        print("Migration: Added column image_url to users table")
-    except Exception:
-        pass
-
 
 @app.get("/")
 def root():
@@ -63,16 +81,20 @@ def root():
 
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    if not config.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/test-db")
-def test_db():
-    db = SessionLocal()
+def test_db(db: Session = Depends(get_db)):
     try:
         db.execute(text("SELECT 1"))
         return {"message": "Database connected successfully"}
     except Exception as e:
         return {"error": str(e)}
-    finally:
-        db.close()
 
 app.include_router(auth.router)
 
@@ -0,0 +1,224 @@
+from sqlalchemy import (
+    Table, Column, Index, Integer, String, DateTime, MetaData,
+    inspect, select, update, delete, func, text
+)
+
+from app.database import Base
+from app import models  # noqa: F401  (registers every model on Base.metadata)
+from app.models.cart_item import CartItem
+from app.models.stock_reservation import StockReservation
+from app.models.idempotency_key import IdempotencyKey
+from app.models.outbox_event import OutboxEvent
+from app.utils.search import create_fulltext_index
+from app.utils.sales_rollup import recompute_daily_sales
+
+# Bookkeeping table: one row per applied migration
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, server_default=func.now())
+)
+
+
+def add_missing_columns(conn, table_name, columns):
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    for col_name, col_type in columns:
+        if col_name not in existing:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}"))
+            print(f"Migration: Added column {col_name} to {table_name} table")
+
+
+def index(name, table_name, *columns, unique=False):
+    # Built on a throwaway Table rather than the model, so a step creates
+    # exactly the index it was written for, whatever the models declare today
+    table = Table(table_name, MetaData(), *(Column(column) for column in columns))
+    return Index(name, *(table.c[column] for column in columns), unique=unique)
+
+
+def create_missing_indexes(conn, *indexes):
+    for idx in indexes:
+        idx.create(conn, checkfirst=True)
+
+
+# Migrations must be idempotent: version 1 creates tables from the current
+# models, so later steps may find their changes already in place.
+def _baseline(conn):
+    Base.metadata.create_all(bind=conn)
+
+    add_missing_columns(conn, "orders", [
+        ("name", "VARCHAR(100)"),
+        ("email", "VARCHAR(150)"),
+        ("address", "VARCHAR(255)"),
+        ("city", "VARCHAR(100)"),
+        ("state", "VARCHAR(100)"),
+        ("pincode", "VARCHAR(20)"),
+        ("phone", "VARCHAR(20)"),
+        ("payment_method", "VARCHAR(50)")
+    ])
+    add_missing_columns(conn, "users", [
+        ("image_url", "VARCHAR(255)")
+    ])
+
+    # daily_sales is created above; seed it from existing orders so the
+    # sales dashboard is right from the first request
+    recompute_daily_sales(conn)
+
+
+def _order_indexes(conn):
+    create_missing_indexes(
+        conn,
+        index("ix_order_items_product_id", "order_items", "product_id"),
+        index("ix_orders_user_id_created_at", "orders", "user_id", "created_at")
+    )
+
+
+def _merge_duplicate_cart_items(conn):
+    # Fold duplicate (cart_id, product_id) rows into the oldest one so the
+    # unique index can be built
+    duplicates = conn.execute(
+        select(
+            CartItem.cart_id,
+            CartItem.product_id,
+            func.min(CartItem.id),
+            func.sum(CartItem.quantity)
+        )
+        .group_by(CartItem.cart_id, CartItem.product_id)
+        .having(func.count(CartItem.id) > 1)
+    ).all()
+
+    for cart_id, product_id, keep_id, quantity in duplicates:
+        conn.execute(
+            update(CartItem).where(CartItem.id == keep_id).values(quantity=quantity)
+        )
+        conn.execute(delete(CartItem).where(
+            CartItem.cart_id == cart_id,
+            CartItem.product_id == product_id,
+            CartItem.id != keep_id
+        ))
+
+
+def _query_pattern_indexes(conn):
+    _merge_duplicate_cart_items(conn)
+    create_missing_indexes(
+        conn,
+        index("uq_cart_items_cart_id_product_id", "cart_items", "cart_id", "product_id", unique=True),
+        index("ix_products_status_vendor_id", "products", "status", "vendor_id"),
+        index("ix_users_role_category", "users", "role", "category"),
+        index("ix_guests_user_id", "guests", "user_id"),
+        index("ix_memberships_user_id", "memberships", "user_id")
+    )
+
+
+def _product_search(conn):
+    create_fulltext_index(conn)
+
+
+def _product_sku(conn):
+    add_missing_columns(conn, "products", [
+        ("sku", "VARCHAR(64)")
+    ])
+    create_missing_indexes(
+        conn,
+        index("uq_products_vendor_id_sku", "products", "vendor_id", "sku", unique=True)
+    )
+
+
+def _membership_expiry(conn):
+    if conn.dialect.name == "mysql":
+        conn.execute(text(
+            "ALTER TABLE memberships MODIFY COLUMN status "
+            "ENUM('active', 'cancelled', 'expired')"
+        ))
+    create_missing_indexes(
+        conn,
+        index("ix_memberships_status_end_date", "memberships", "status", "end_date")
+    )
+
+
+def _stock_reservations(conn):
+    StockReservation.__table__.create(conn, checkfirst=True)
+
+
+def _idempotency_keys(conn):
+    IdempotencyKey.__table__.create(conn, checkfirst=True)
+
+
+def _outbox_events(conn):
+    OutboxEvent.__table__.create(conn, checkfirst=True)
+
+
+def _vendor_event_stream(conn):
+    add_missing_columns(conn, "outbox_events", [
+        ("vendor_id", "INTEGER")
+    ])
+    create_missing_indexes(
+        conn,
+        index("ix_outbox_events_vendor_id_id", "outbox_events", "vendor_id", "id")
+    )
+
+
+def _order_item_order_index(conn):
+    # InnoDB already indexes the foreign key, SQLite does not
+    create_missing_indexes(
+        conn,
+        index("ix_order_items_order_id", "order_items", "order_id")
+    )
+
+
+MIGRATIONS = [
+    (1, "baseline schema and legacy checkout/user columns", _baseline),
+    (2, "indexes on order_items.product_id and orders(user_id, created_at)", _order_indexes),
+    (3, "composite indexes for hot queries and unique cart items", _query_pattern_indexes),
+    (4, "full-text index on products(name, description)", _product_search),
+    (5, "vendor product SKUs for bulk upserts", _product_sku),
+    (6, "expired membership status and (status, end_date) index", _membership_expiry),
+    (7, "stock_reservations table for add-to-cart holds", _stock_reservations),
+    (8, "idempotency_keys table for checkout retries", _idempotency_keys),
+    (9, "outbox_events table for order notifications", _outbox_events),
+    (10, "outbox_events.vendor_id for the vendor event stream", _vendor_event_stream),
+    (11, "index on order_items.order_id for order item lookups", _order_item_order_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def migrate(engine):
+    with engine.begin() as conn:
+        schema_version.create(conn, checkfirst=True)
+
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    for number, description, step in MIGRATIONS:
+        if number <= version:
+            continue
+        # MySQL commits DDL implicitly, which is why every step is idempotent
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(schema_version.insert().values(
+                version=number,
+                description=description
+            ))
+        print(f"Applied migration {number}: {description}")
+
+    return LATEST_VERSION
+
+
+def check_schema_version(engine):
+    # Cheap startup check: one SELECT instead of DDL on every worker boot
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    if version < LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            "Run `python migrate.py` from the backend directory."
+        )
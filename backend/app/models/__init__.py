@@ -4,4 +4,9 @@ from .product import Product
 from .cart import Cart
 from .order import Order
 from .cart_item import CartItem
-from .order_item import OrderItem
\ No newline at end of file
+from .order_item import OrderItem
+from .guest import Guest
+from .daily_sales import DailySales
+from .stock_reservation import StockReservation
+from .idempotency_key import IdempotencyKey
+from .outbox_event import OutboxEvent
\ No newline at end of file
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Date, DECIMAL
+from app.database import Base
+
+
+class DailySales(Base):
+    __tablename__ = "daily_sales"
+
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
@@ -6,7 +6,7 @@ class Guest(Base):
     __tablename__ = "guests"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
 
     name = Column(String(100), nullable=False)
     contact_number = Column(String(20), nullable=False)
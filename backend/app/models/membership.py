@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum, Date
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Date, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -7,6 +7,7 @@ import enum
 class MembershipStatus(str, enum.Enum):
     active = "active"
     cancelled = "cancelled"
+    expired = "expired"
 
 
 class MembershipDuration(str, enum.Enum):
@@ -17,9 +18,12 @@ class MembershipDuration(str, enum.Enum):
 
 class Membership(Base):
     __tablename__ = "memberships"
+    __table_args__ = (
+        Index("ix_memberships_status_end_date", "status", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     duration = Column(Enum(MembershipDuration), default=MembershipDuration.six_months)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, ForeignKey, DECIMAL, String
+from sqlalchemy.orm import relationship
 from app.database import Base
 
 
@@ -6,8 +7,10 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"))
-    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"))
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), index=True)
     quantity = Column(Integer, nullable=False)
     price = Column(DECIMAL(10, 2), nullable=False)
-    shipping_status = Column(String(50), default="received")
\ No newline at end of file
+    shipping_status = Column(String(50), default="received")
+
+    product = relationship("Product")
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Pending scan: undelivered events that are due, oldest first
+        Index("ix_outbox_events_delivered_at_next_attempt_at", "delivered_at", "next_attempt_at"),
+        # Per-vendor replay for /vendor/stream
+        Index("ix_outbox_events_vendor_id_id", "vendor_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)
+
+    # Vendor the event concerns, if any; drives the vendor event stream
+    vendor_id = Column(Integer)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Delivery state, owned by the outbox worker
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    delivered_at = Column(DateTime)
+    last_error = Column(Text)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DECIMAL, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DECIMAL, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -12,11 +12,18 @@ class ProductStatus(str, enum.Enum):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_status_vendor_id", "status", "vendor_id"),
+        Index("uq_products_vendor_id_sku", "vendor_id", "sku", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     vendor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
 
+    # Vendor-supplied identifier used by bulk upserts
+    sku = Column(String(64), nullable=True)
+
     name = Column(String(150), nullable=False)
     description = Column(String(500))
 
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from app.database import Base
+
+
+class StockReservation(Base):
+    __tablename__ = "stock_reservations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cart_item_id = Column(Integer, ForeignKey("cart_items.id", ondelete="CASCADE"), unique=True, nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), index=True, nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    # Naive UTC; the hold stops counting against stock after this moment
+    expires_at = Column(DateTime, nullable=False, index=True)
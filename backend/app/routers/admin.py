@@ -1,32 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, or_, and_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
+from typing import List, Optional
 from dateutil.relativedelta import relativedelta
 
-from app.database import SessionLocal
-from app.models.membership import Membership
+from app.database import SessionLocal, get_db, get_async_db, engine, async_engine
+from app.models.membership import Membership, MembershipStatus
 from app.models.user import User
 from app.models.order import Order
+from app.models.daily_sales import DailySales
 from app.schemas.membership_schema import (
     CreateMembershipSchema,
     ExtendMembershipSchema,
-    CancelMembershipSchema
+    CancelMembershipSchema,
+    BatchExtendMembershipSchema,
+    BatchCancelMembershipSchema,
+    BatchMembershipResultSchema,
+    MembershipResponseSchema
 )
 from app.schemas.auth_schema import SignupSchema
-from app.utils.security import hash_password
-from app.dependencies.role_checker import require_role
+from app.schemas.user_schema import UserResponseSchema
+from app.schemas.order_schema import OrderResponseSchema, TransactionReportSchema
+from app.utils.security import hash_password_async, password_hasher
+from app.utils.sales_rollup import bucket_start
+from app.utils.memberships import extend_memberships, cancel_memberships
+from app.utils.export import stream_rows, stream_csv, stream_ndjson
+from app.utils.pool_metrics import pool_metrics, async_pool_metrics
+from app.dependencies.role_checker import require_role, require_role_async
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # Create Membership (Admin Only)
 @router.post("/create-membership")
 def create_membership(
@@ -86,6 +93,9 @@ def extend_membership(
 
     membership.end_date = membership.end_date + relativedelta(months=data.months)
 
+    if membership.status == "expired" and membership.end_date >= date.today():
+        membership.status = "active"
+
     db.commit()
 
     return {"message": "Membership extended successfully"}
@@ -110,28 +120,110 @@ def cancel_membership(
 
     return {"message": "Membership cancelled successfully"}
 
-@router.get("/memberships")
+
+# Extend Memberships in bulk (one UPDATE)
+@router.put("/extend-memberships", response_model=BatchMembershipResultSchema)
+def extend_memberships_batch(
+    data: BatchExtendMembershipSchema,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("admin"))
+):
+    ids = set(data.membership_ids)
+    if not ids:
+        return {"updated": 0, "rejected": []}
+
+    extendable = set(db.scalars(select(Membership.id).where(
+        Membership.id.in_(ids),
+        Membership.status != "cancelled"
+    )).all())
+
+    updated = extend_memberships(db, extendable, data.months) if extendable else 0
+
+    return {"updated": updated, "rejected": sorted(ids - extendable)}
+
+
+# Cancel Memberships in bulk (one UPDATE)
+@router.put("/cancel-memberships", response_model=BatchMembershipResultSchema)
+def cancel_memberships_batch(
+    data: BatchCancelMembershipSchema,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("admin"))
+):
+    ids = set(data.membership_ids)
+    if not ids:
+        return {"updated": 0, "rejected": []}
+
+    found = set(db.scalars(select(Membership.id).where(
+        Membership.id.in_(ids)
+    )).all())
+
+    updated = cancel_memberships(db, found) if found else 0
+
+    return {"updated": updated, "rejected": sorted(ids - found)}
+
+@router.get("/memberships", response_model=List[MembershipResponseSchema])
 def get_all_memberships(
+    status: Optional[MembershipStatus] = None,
+    expires_from: Optional[date] = None,
+    expires_to: Optional[date] = None,
+    after_end_date: Optional[date] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
 ):
-    memberships = db.query(Membership).all()
-    result = []
-    for m in memberships:
-        user = db.query(User).filter(User.id == m.user_id).first()
-        result.append({
+    # Single Membership JOIN User query ordered by (end_date, id). Pass the
+    # end_date and id of the last row as after_end_date/after_id to page.
+    query = db.query(
+        Membership.id,
+        Membership.user_id,
+        Membership.duration,
+        Membership.start_date,
+        Membership.end_date,
+        Membership.status,
+        User.name.label("user_name")
+    ).outerjoin(Membership.user)
+
+    if status:
+        query = query.filter(Membership.status == status)
+
+    if expires_from:
+        query = query.filter(Membership.end_date >= expires_from)
+
+    if expires_to:
+        query = query.filter(Membership.end_date <= expires_to)
+
+    # Both halves of the keyset or neither; half a cursor would quietly
+    # restart from the first page
+    if (after_end_date is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_end_date and after_id must be given together"
+        )
+
+    if after_end_date is not None:
+        query = query.filter(or_(
+            Membership.end_date > after_end_date,
+            and_(Membership.end_date == after_end_date, Membership.id > after_id)
+        ))
+
+    rows = query.order_by(Membership.end_date, Membership.id).limit(limit).all()
+
+    return [
+        {
             "id": m.id,
             "user_id": m.user_id,
-            "user_name": user.name if user else "Unknown",
+            "user_name": m.user_name or "Unknown",
             "duration": m.duration,
             "start_date": m.start_date,
             "end_date": m.end_date,
             "status": m.status
-        })
-    return result
+        }
+        for m in rows
+    ]
 
 # view all users
-@router.get("/users")
+@router.get("/users", response_model=List[UserResponseSchema])
 def get_all_users(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
@@ -177,7 +269,7 @@ def delete_user(
     return {"message": "User deleted successfully"}
 
 #view all vendors
-@router.get("/vendors")
+@router.get("/vendors", response_model=List[UserResponseSchema])
 def get_all_vendors(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
@@ -237,7 +329,7 @@ def delete_vendor(
 
 
 #view all transactions
-@router.get("/transactions")
+@router.get("/transactions", response_model=List[OrderResponseSchema])
 def view_all_transactions(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
@@ -245,8 +337,53 @@ def view_all_transactions(
     orders = db.query(Order).all()
     return orders
 
+#export transactions (streamed)
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    current_user = Depends(require_role("admin"))
+):
+    columns = [
+        "order_id", "user_id", "name", "email", "total_amount",
+        "status", "payment_method", "created_at"
+    ]
+
+    query = select(
+        Order.id.label("order_id"),
+        Order.user_id,
+        Order.name,
+        Order.email,
+        Order.total_amount,
+        Order.status,
+        Order.payment_method,
+        Order.created_at
+    ).order_by(Order.id)
+
+    if from_date:
+        query = query.where(Order.created_at >= from_date)
+
+    if to_date:
+        query = query.where(Order.created_at < to_date + timedelta(days=1))
+
+    partitions = stream_rows(SessionLocal, query)
+
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_ndjson(partitions, columns),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=transactions.ndjson"}
+        )
+
+    return StreamingResponse(
+        stream_csv(partitions, columns),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=transactions.csv"}
+    )
+
 #transaction report
-@router.get("/transaction-report")
+@router.get("/transaction-report", response_model=List[TransactionReportSchema])
 def transaction_report(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
@@ -273,26 +410,71 @@ def sales_summary(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("admin"))
 ):
-    total_orders = db.query(func.count(Order.id)).scalar()
-    total_revenue = db.query(func.sum(Order.total_amount)).scalar()
+    # Read from the daily rollup rather than scanning orders
+    total_orders, total_revenue = db.query(
+        func.sum(DailySales.order_count),
+        func.sum(DailySales.revenue)
+    ).one()
 
     return {
-        "total_orders": total_orders,
+        "total_orders": total_orders or 0,
         "total_revenue": float(total_revenue) if total_revenue else 0
     }
 
+#sales analytics bucketed by day / week / month
+@router.get("/sales-analytics")
+def sales_analytics(
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("admin"))
+):
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=30)
+
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    days = db.query(DailySales).filter(
+        DailySales.day >= from_date,
+        DailySales.day <= to_date
+    ).order_by(DailySales.day).all()
+
+    # At most one row per day, so bucketing in Python is cheap and portable
+    buckets = {}
+    for d in days:
+        start = bucket_start(d.day, bucket)
+        entry = buckets.setdefault(start, {"order_count": 0, "revenue": 0})
+        entry["order_count"] += d.order_count
+        entry["revenue"] += d.revenue
+
+    return {
+        "bucket": bucket,
+        "from": from_date,
+        "to": to_date,
+        "data": [
+            {
+                "period_start": start,
+                "order_count": entry["order_count"],
+                "revenue": float(entry["revenue"])
+            }
+            for start, entry in buckets.items()
+        ]
+    }
+
 # Add User (Admin Only)
 @router.post("/add-user")
-def add_user(
+async def add_user(
     user_data: SignupSchema,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("admin"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("admin"))
 ):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    if result.scalars().first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pwd = hash_password(user_data.passwords)
+    hashed_pwd = await hash_password_async(user_data.passwords, db)
 
     new_user = User(
         name=user_data.name,
@@ -302,26 +484,25 @@ def add_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return {"message": "User created successfully by admin"}
 
 # Add Vendor (Admin Only)
 @router.post("/add-vendor")
-def add_vendor(
+async def add_vendor(
     user_data: SignupSchema,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("admin"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("admin"))
 ):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    if result.scalars().first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
     if not user_data.category:
         raise HTTPException(status_code=400, detail="Category is required for vendor")
 
-    hashed_pwd = hash_password(user_data.passwords)
+    hashed_pwd = await hash_password_async(user_data.passwords, db)
 
     new_user = User(
         name=user_data.name,
@@ -332,7 +513,22 @@ def add_vendor(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return {"message": "Vendor created successfully by admin"}
+
+# Connection pool stats (Admin Only)
+@router.get("/pool-stats")
+def pool_stats(
+    current_user = Depends(require_role("admin"))
+):
+    stats = pool_metrics.snapshot(engine.pool)
+    stats["async"] = async_pool_metrics.snapshot(async_engine.sync_engine.pool)
+    return stats
+
+# Password hashing stats (Admin Only)
+@router.get("/hashing-stats")
+def hashing_stats(
+    current_user = Depends(require_role("admin"))
+):
+    return password_hasher.snapshot()
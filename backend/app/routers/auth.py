@@ -1,29 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import config
+from app.database import get_async_db
+from app.dependencies.rate_limit import rate_limit
 from app.models.user import User
 from app.schemas.auth_schema import SignupSchema, LoginSchema
-from app.utils.security import hash_password, verify_password
+from app.utils.security import hash_password_async, verify_password_async
 from app.utils.token import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
 
-@router.post("/signup")
-def signup(user_data: SignupSchema, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+@router.post("/signup", dependencies=[Depends(rate_limit("signup", config.RATE_LIMIT_SIGNUP, key_by="ip"))])
+async def signup(user_data: SignupSchema, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await get_user_by_email(db, user_data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pwd = hash_password(user_data.passwords)
+    hashed_pwd = await hash_password_async(user_data.passwords, db)
 
     new_user = User(
         name=user_data.name,
@@ -35,20 +35,19 @@ def signup(user_data: SignupSchema, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return {"message": "User created successfully"}
 
 
-@router.post("/login")
-def login(login_data: LoginSchema, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
+@router.post("/login", dependencies=[Depends(rate_limit("login", config.RATE_LIMIT_LOGIN, key_by="ip"))])
+async def login(login_data: LoginSchema, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email(db, login_data.email)
 
     if not user:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    if not verify_password(login_data.passwords, user.passwords):
+    if not await verify_password_async(login_data.passwords, user.passwords, db):
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
     token = create_access_token({
@@ -59,4 +58,4 @@ def login(login_data: LoginSchema, db: Session = Depends(get_db)):
     return {
         "access_token": token,
         "token_type": "bearer"
-    }
\ No newline at end of file
+    }
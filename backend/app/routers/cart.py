@@ -1,148 +1,248 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, cast, DECIMAL
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app import config
+from app.database import get_async_db
 from app.models.cart import Cart
-from app.models.product import Product
+from app.models.product import Product, ProductStatus
 from app.models.cart_item import CartItem
-from app.schemas.cart_schema import AddToCartSchema, UpdateQuantitySchema
-from app.dependencies.role_checker import require_role
+from app.models.stock_reservation import StockReservation
+from app.schemas.cart_schema import AddToCartSchema, UpdateQuantitySchema, CartViewSchema
+from app.dependencies.role_checker import require_role_async
+from app.dependencies.rate_limit import rate_limit
+from app.utils.reservations import reserved_by_others, save_reservation
 
 router = APIRouter(prefix="/cart", tags=["Cart"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_user_cart(db: AsyncSession, user_id: int):
+    result = await db.execute(select(Cart).where(Cart.user_id == user_id))
+    return result.scalars().first()
 
 
-#Add to Cart
-@router.post("/add")
-def add_to_cart(
-    data: AddToCartSchema,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
-):
-    product = db.query(Product).filter(Product.id == data.product_id).first()
+async def lock_available_product(db: AsyncSession, product_id: int):
+    # Row lock on the product serializes every reservation for it, so two carts
+    # can never both be promised the last unit.
+    result = await db.execute(
+        select(Product).where(Product.id == product_id).with_for_update()
+    )
+    product = result.scalars().first()
 
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    if product.status != ProductStatus.available:
+        raise HTTPException(status_code=400, detail=f"{product.name} is not available")
+
+    return product
+
+
+async def reserve_quantity(db: AsyncSession, product, cart_item_id, quantity: int, now: datetime):
+    reserved = await db.scalar(reserved_by_others(product.id, cart_item_id, now))
+    available = product.stock - reserved
+
+    if quantity > available:
+        detail = f"Insufficient stock for {product.name}. Available: {max(available, 0)}"
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=detail)
+
+
+#Add to Cart
+@router.post("/add", dependencies=[Depends(rate_limit("cart", config.RATE_LIMIT_CART))])
+async def add_to_cart(
+    data: AddToCartSchema,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
+):
+    if data.quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be positive")
+
+    cart = await get_user_cart(db, current_user.id)
 
     if not cart:
         cart = Cart(user_id=current_user.id)
         db.add(cart)
-        db.commit()
-        db.refresh(cart)
+
+    # End the read transaction so the product lock below starts a fresh one
+    # and the reads after it see every reservation committed before it.
+    await db.commit()
+
+    now = datetime.utcnow()
+    product = await lock_available_product(db, data.product_id)
 
     # Check if item already exists in cart
-    cart_item = db.query(CartItem).filter(
+    result = await db.execute(select(CartItem).where(
         CartItem.cart_id == cart.id,
         CartItem.product_id == data.product_id
-    ).first()
+    ))
+    cart_item = result.scalars().first()
+
+    quantity = data.quantity + (cart_item.quantity if cart_item else 0)
+    await reserve_quantity(db, product, cart_item.id if cart_item else None, quantity, now)
 
     if cart_item:
-        cart_item.quantity += data.quantity
+        cart_item.quantity = quantity
     else:
         cart_item = CartItem(
             cart_id=cart.id,
             product_id=data.product_id,
-            quantity=data.quantity
+            quantity=quantity
         )
         db.add(cart_item)
 
-    db.commit()
+    try:
+        await db.flush()
+        reservation = await save_reservation(db, cart_item.id, product.id, quantity, now)
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request added the same product to this cart first
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Cart was updated concurrently, please retry")
 
-    return {"message": "Product added/updated in cart"}
+    return {"message": "Product added/updated in cart", "reserved_until": reservation.expires_at}
 
 
 @router.put("/update-quantity")
-def update_quantity(
+async def update_quantity(
     data: UpdateQuantitySchema,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    cart = await get_user_cart(db, current_user.id)
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
 
-    item = db.query(CartItem).filter(
+    result = await db.execute(select(CartItem).where(
         CartItem.id == data.cart_item_id,
         CartItem.cart_id == cart.id
-    ).first()
+    ))
+    item = result.scalars().first()
 
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     if data.quantity <= 0:
-        db.delete(item)
-    else:
-        item.quantity = data.quantity
+        await db.execute(delete(StockReservation).where(StockReservation.cart_item_id == item.id))
+        await db.delete(item)
+        await db.commit()
+        return {"message": "Quantity updated"}
+
+    await db.commit()
 
-    db.commit()
-    return {"message": "Quantity updated"}
+    now = datetime.utcnow()
+    product = await lock_available_product(db, item.product_id)
+    await reserve_quantity(db, product, item.id, data.quantity, now)
+
+    item.quantity = data.quantity
+    reservation = await save_reservation(db, item.id, product.id, data.quantity, now)
+
+    await db.commit()
+    return {"message": "Quantity updated", "reserved_until": reservation.expires_at}
 
 
 # Remove from Cart
 @router.delete("/remove/{item_id}")
-def remove_from_cart(
+async def remove_from_cart(
     item_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    cart = await get_user_cart(db, current_user.id)
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
 
-    item = db.query(CartItem).filter(
+    result = await db.execute(select(CartItem).where(
         CartItem.id == item_id,
         CartItem.cart_id == cart.id
-    ).first()
+    ))
+    item = result.scalars().first()
 
     if not item:
         raise HTTPException(status_code=404, detail="Item not found in your cart")
 
-    db.delete(item)
-    db.commit()
+    await db.execute(delete(StockReservation).where(StockReservation.cart_item_id == item.id))
+    await db.delete(item)
+    await db.commit()
 
     return {"message": "Item removed from cart"}
 
 
 #View Cart
-@router.get("/my-cart")
-def view_cart(
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+@router.get("/my-cart", response_model=CartViewSchema)
+async def view_cart(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
-
-    if not cart:
-        return {"items": [], "grand_total": 0}
-
-    items = db.query(CartItem).filter(CartItem.cart_id == cart.id).all()
+    # One CartItem JOIN Product query; line totals and the grand total are
+    # computed by the database in DECIMAL so no float rounding creeps in.
+    now = datetime.utcnow()
+    item_total = cast(Product.price * CartItem.quantity, DECIMAL(12, 2))
+    held_elsewhere = reserved_by_others(Product.id, CartItem.id, now).scalar_subquery()
+
+    result = await db.execute(select(
+        CartItem.id,
+        CartItem.quantity,
+        Product.id.label("product_id"),
+        Product.name,
+        Product.price,
+        Product.stock,
+        Product.status,
+        StockReservation.quantity.label("reserved_quantity"),
+        StockReservation.expires_at.label("reserved_until"),
+        (Product.stock - held_elsewhere).label("available_stock"),
+        item_total.label("item_total"),
+        func.sum(item_total).over().label("grand_total")
+    ).join(
+        Cart, CartItem.cart_id == Cart.id
+    ).join(
+        Product, CartItem.product_id == Product.id
+    ).outerjoin(
+        StockReservation, StockReservation.cart_item_id == CartItem.id
+    ).where(
+        Cart.user_id == current_user.id
+    ).order_by(CartItem.id))
+    rows = result.all()
+
+    if not rows:
+        return {"items": [], "grand_total": 0, "unavailable_items": []}
 
     result_items = []
-    grand_total = 0
+    unavailable_items = []
 
-    for item in items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        item_total = float(product.price) * item.quantity
-        grand_total += item_total
+    for row in rows:
+        reserved = row.reserved_until is not None and row.reserved_until > now \
+            and row.reserved_quantity >= row.quantity
+        available = row.status == ProductStatus.available and (
+            reserved or row.available_stock >= row.quantity
+        )
 
         result_items.append({
-            "cart_item_id": item.id,
-            "product_id": product.id,
-            "product_name": product.name,
-            "price": float(product.price),
-            "quantity": item.quantity,
-            "item_total": item_total
+            "cart_item_id": row.id,
+            "product_id": row.product_id,
+            "product_name": row.name,
+            "price": row.price,
+            "quantity": row.quantity,
+            "item_total": row.item_total,
+            "stock": row.stock,
+            "available": available,
+            "reserved_until": row.reserved_until if reserved else None
         })
 
+        if not available:
+            unavailable_items.append({
+                "cart_item_id": row.id,
+                "product_id": row.product_id,
+                "product_name": row.name,
+                "reason": "unavailable" if row.status != ProductStatus.available else "insufficient_stock",
+                "available_stock": max(row.available_stock, 0)
+            })
+
     return {
         "items": result_items,
-        "grand_total": grand_total
-    }
\ No newline at end of file
+        "grand_total": rows[0].grand_total,
+        "unavailable_items": unavailable_items
+    }
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import select, insert, delete, func
 from sqlalchemy.orm import Session
+from typing import List
 
-from app.database import SessionLocal
+from app.database import SessionLocal, get_db
 from app.models.guest import Guest
-from app.schemas.guest_schema import GuestCreateSchema, GuestUpdateSchema
+from app.schemas.guest_schema import (
+    GuestCreateSchema,
+    GuestUpdateSchema,
+    GuestResponseSchema,
+    GuestImportResultSchema,
+    GuestBulkDeleteSchema,
+    GuestBulkDeleteResultSchema
+)
 from app.dependencies.role_checker import require_role
+from app.utils.uploads import iter_upload_rows, batched, validation_message
+from app.utils.export import stream_rows, stream_csv
 
 router = APIRouter(prefix="/guest", tags=["Guest"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # Add Guest
 @router.post("/add")
 def add_guest(
@@ -39,7 +44,7 @@ def add_guest(
 
 
 # View Guest List
-@router.get("/my-guests")
+@router.get("/my-guests", response_model=List[GuestResponseSchema])
 def view_guests(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("user"))
@@ -93,4 +98,122 @@ def delete_guest(
     db.delete(guest)
     db.commit()
 
-    return {"message": "Guest deleted successfully"}
\ No newline at end of file
+    return {"message": "Guest deleted successfully"}
+
+
+# Import Guests (CSV: name, contact_number, email)
+@router.post("/import", response_model=GuestImportResultSchema)
+def import_guests(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("user"))
+):
+    imported = 0
+    duplicates = 0
+    errors = []
+    seen = set()
+
+    for batch in batched(iter_upload_rows(file.file, "csv")):
+        valid = []
+
+        for row_number, data, error in batch:
+            try:
+                guest = GuestCreateSchema(**data)
+            except ValidationError as e:
+                errors.append({
+                    "row": row_number,
+                    "email": data.get("email"),
+                    "error": validation_message(e)
+                })
+                continue
+
+            email = guest.email.lower()
+            if email in seen:
+                duplicates += 1
+                continue
+
+            seen.add(email)
+            valid.append(guest)
+
+        if not valid:
+            continue
+
+        # Drop guests already on the user's list with one lookup per batch
+        existing = set(db.scalars(
+            select(func.lower(Guest.email)).where(
+                Guest.user_id == current_user.id,
+                func.lower(Guest.email).in_([g.email.lower() for g in valid])
+            )
+        ).all())
+
+        rows = [
+            {
+                "user_id": current_user.id,
+                "name": g.name,
+                "contact_number": g.contact_number,
+                "email": g.email
+            }
+            for g in valid
+            if g.email.lower() not in existing
+        ]
+        duplicates += len(valid) - len(rows)
+
+        if rows:
+            db.execute(insert(Guest), rows)
+            db.commit()
+            imported += len(rows)
+
+    return {"imported": imported, "duplicates": duplicates, "errors": errors}
+
+
+# Export Guests (streamed CSV)
+@router.get("/export")
+def export_guests(
+    current_user = Depends(require_role("user"))
+):
+    columns = ["id", "name", "contact_number", "email"]
+
+    query = select(
+        Guest.id,
+        Guest.name,
+        Guest.contact_number,
+        Guest.email
+    ).where(
+        Guest.user_id == current_user.id
+    ).order_by(Guest.id)
+
+    return StreamingResponse(
+        stream_csv(stream_rows(SessionLocal, query), columns),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=guests.csv"}
+    )
+
+
+# Bulk Delete Guests
+@router.post("/bulk-delete", response_model=GuestBulkDeleteResultSchema)
+def bulk_delete_guests(
+    data: GuestBulkDeleteSchema,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("user"))
+):
+    ids = set(data.ids)
+
+    if not ids:
+        return {"deleted": 0, "not_found": []}
+
+    owned = set(db.scalars(
+        select(Guest.id).where(
+            Guest.user_id == current_user.id,
+            Guest.id.in_(ids)
+        )
+    ).all())
+
+    if owned:
+        db.execute(
+            delete(Guest)
+            .where(Guest.user_id == current_user.id, Guest.id.in_(owned))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    return {"deleted": len(owned), "not_found": sorted(ids - owned)}
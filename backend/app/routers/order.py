@@ -1,56 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from app.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from decimal import Decimal
+from datetime import datetime
+
+from app import config
+from app.database import get_db, get_async_db
 from app.models.cart import Cart
 from app.models.cart_item import CartItem
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.product import Product
-from app.dependencies.role_checker import require_role
+from app.models.stock_reservation import StockReservation
+from app.dependencies.role_checker import require_role, require_role_async
+from app.dependencies.rate_limit import rate_limit
 from app.schemas.checkout_schema import CheckoutSchema
+from app.schemas.order_schema import MyOrderSchema
+from app.utils.sales_rollup import record_sale
+from app.utils.reservations import reserved_by_others
+from app.utils.outbox import add_events
+from app.utils.event_stream import event_broker
+from app.utils.idempotency import request_hash, claim_idempotency_key, store_response, replay_response
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.post("/checkout")
+@router.post("/checkout", dependencies=[Depends(rate_limit("checkout", config.RATE_LIMIT_CHECKOUT))])
 def checkout(
     checkout_data: CheckoutSchema,
     db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+    current_user = Depends(require_role("user")),
+    idempotency_key: Optional[str] = Header(None, max_length=255)
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
-
-    if not cart:
-        raise HTTPException(status_code=400, detail="Cart is empty")
+    # Everything below runs in one transaction and is committed once at the end
+    idempotency = None
+    if idempotency_key:
+        idempotency = claim_idempotency_key(
+            db, current_user.id, idempotency_key, request_hash(checkout_data)
+        )
 
-    cart_items = db.query(CartItem).filter(
-        CartItem.cart_id == cart.id
-    ).all()
+        # Retry of a checkout that already went through
+        if idempotency.response_body is not None:
+            return replay_response(idempotency)
+
+    cart_items = db.query(
+        CartItem.id,
+        CartItem.cart_id,
+        CartItem.product_id,
+        CartItem.quantity,
+        Product.name,
+        Product.price,
+        Product.stock,
+        Product.vendor_id
+    ).join(
+        Cart, CartItem.cart_id == Cart.id
+    ).join(
+        Product, CartItem.product_id == Product.id
+    ).filter(
+        Cart.user_id == current_user.id
+    ).order_by(CartItem.product_id).all()
 
     if not cart_items:
         raise HTTPException(status_code=400, detail="Cart is empty")
 
-    total = 0
+    total = Decimal("0")
+    now = datetime.utcnow()
 
+    # Conditional decrement: the row only changes if enough stock is left at
+    # write time once other carts' active holds are set aside, so concurrent
+    # checkouts can never push stock below zero or take reserved units. An
+    # item with a live reservation of its own always passes.
+    # Products are updated in id order to keep lock ordering consistent.
     for item in cart_items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail="Product not found")
-        if product.stock < item.quantity:
+        held_elsewhere = reserved_by_others(item.product_id, item.id, now).scalar_subquery()
+
+        updated = db.query(Product).filter(
+            Product.id == item.product_id,
+            Product.stock - held_elsewhere >= item.quantity
+        ).update(
+            {Product.stock: Product.stock - item.quantity},
+            synchronize_session=False
+        )
+
+        if not updated:
+            # Report what could be promised now, as /cart/add does: current
+            # stock less other carts' holds, not the stock read above
+            stock, held = db.execute(
+                select(Product.stock, held_elsewhere).where(Product.id == item.product_id)
+            ).one()
+            db.rollback()
             raise HTTPException(
-                status_code=400, 
-                detail=f"Insufficient stock for {product.name}. Available: {product.stock}"
+                status_code=400,
+                detail=f"Insufficient stock for {item.name}. Available: {max(stock - held, 0)}"
             )
-        total += float(product.price) * item.quantity
+
+        total += item.price * item.quantity
 
     order = Order(
         user_id=current_user.id,
@@ -69,54 +115,95 @@ def checkout(
     )
 
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    db.flush()
 
-    for item in cart_items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-
-        # Reduce stock
-        product.stock -= item.quantity
+    db.execute(insert(OrderItem), [
+        {
+            "order_id": order.id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "price": item.price,
+            "shipping_status": "received"
+        }
+        for item in cart_items
+    ])
 
-        order_item = OrderItem(
-            order_id=order.id,
-            product_id=product.id,
-            quantity=item.quantity,
-            price=product.price,
-            shipping_status="received"  
-        )
+    record_sale(db, total)
 
-        db.add(order_item)
+    # Order events go out through the outbox, committed with the order itself
+    order_items = db.execute(
+        select(OrderItem.id, OrderItem.product_id, OrderItem.quantity, OrderItem.price)
+        .where(OrderItem.order_id == order.id)
+    ).all()
+    vendor_ids = {item.product_id: item.vendor_id for item in cart_items}
 
-    db.commit()
+    add_events(db, [
+        ("order_placed", {
+            "order_id": order.id,
+            "user_id": current_user.id,
+            "total_amount": float(total),
+            "item_count": len(order_items)
+        })
+    ] + [
+        ("order_item_created", {
+            "order_item_id": item.id,
+            "order_id": order.id,
+            "product_id": item.product_id,
+            "vendor_id": vendor_ids[item.product_id],
+            "quantity": item.quantity,
+            "price": float(item.price),
+            "shipping_status": "received"
+        })
+        for item in order_items
+    ])
+
+    # Clear cart; the holds are now real stock decrements
+    db.query(StockReservation).filter(
+        StockReservation.cart_item_id.in_([item.id for item in cart_items])
+    ).delete(synchronize_session=False)
+
+    db.query(CartItem).filter(
+        CartItem.cart_id == cart_items[0].cart_id
+    ).delete(synchronize_session=False)
+
+    response = {
+        "message": "Order placed successfully",
+        "order_id": order.id
+    }
 
-    # Clear cart
-    for item in cart_items:
-        db.delete(item)
+    if idempotency:
+        store_response(idempotency, 200, response)
 
     db.commit()
+    event_broker.notify()
 
-    return {
-        "message": "Order placed successfully",
-        "order_id": order.id
-    }
+    return response
 
-@router.get("/my-orders")
-def my_orders(
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+@router.get("/my-orders", response_model=List[MyOrderSchema])
+async def my_orders(
+    after_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    orders = db.query(Order).filter(
+    # Newest first; pass the last order_id of a page as after_id for the next one.
+    # Items and their products are loaded with one IN query each per page.
+    query = select(Order).options(
+        selectinload(Order.items).selectinload(OrderItem.product)
+    ).where(
         Order.user_id == current_user.id
-    ).all()
+    )
+
+    if after_id:
+        query = query.where(Order.id < after_id)
+
+    orders = (await db.execute(
+        query.order_by(Order.id.desc()).limit(limit)
+    )).scalars().all()
 
     result = []
 
     for order in orders:
-        items = db.query(OrderItem).filter(
-            OrderItem.order_id == order.id
-        ).all()
-
         order_data = {
             "order_id": order.id,
             "total_amount": float(order.total_amount),
@@ -126,11 +213,9 @@ def my_orders(
             "items": []
         }
 
-        for item in items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-
+        for item in order.items:
             order_data["items"].append({
-                "product_name": product.name,
+                "product_name": item.product.name if item.product else None,
                 "quantity": item.quantity,
                 "price": float(item.price),
                 "shipping_status": item.shipping_status
@@ -139,4 +224,3 @@ def my_orders(
         result.append(order_data)
 
     return result
-
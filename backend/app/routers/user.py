@@ -1,52 +1,110 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import get_async_db
 from app.models.product import Product
 from app.models.user import User
-from app.dependencies.role_checker import require_role
-from typing import Optional
+from app.dependencies.role_checker import require_role_async
+from app.schemas.user_schema import UserResponseSchema
+from app.schemas.product_schema import ProductResponseSchema, ProductSearchPageSchema
+from app.utils.search import (
+    search_products_query,
+    has_search_terms,
+    encode_cursor,
+    decode_cursor,
+    cursor_value
+)
+from typing import List, Optional
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # View Vendors
-@router.get("/vendors")
-def get_vendors(
+@router.get("/vendors", response_model=List[UserResponseSchema])
+async def get_vendors(
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    query = db.query(User).filter(User.role == "vendor")
+    query = select(User).where(User.role == "vendor")
     if category:
-        query = query.filter(User.category == category)
-    
-    return query.all()
+        query = query.where(User.category == category)
+
+    result = await db.execute(query)
+    return result.scalars().all()
 
 
 # View All Available Products with Filtering
-@router.get("/products")
-def view_products(
+@router.get("/products", response_model=List[ProductResponseSchema])
+async def view_products(
     vendor_id: Optional[int] = None,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(require_role("user"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
 ):
-    query = db.query(Product).filter(Product.status == "available")
+    query = select(Product).where(Product.status == "available")
 
     if vendor_id:
-        query = query.filter(Product.vendor_id == vendor_id)
-    
+        query = query.where(Product.vendor_id == vendor_id)
+
     if category:
         # Join with User to filter by vendor category
-        query = query.join(User, Product.vendor_id == User.id).filter(User.category == category)
+        query = query.join(User, Product.vendor_id == User.id).where(User.category == category)
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+# Full-text Product Search
+@router.get("/products/search", response_model=ProductSearchPageSchema)
+async def search_products(
+    q: str = Query(..., min_length=1),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: str = Query("relevance", pattern="^(relevance|price_asc|price_desc|newest)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("user"))
+):
+    if not has_search_terms(q):
+        return {"items": [], "next_cursor": None}
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    query = search_products_query(
+        db.get_bind().dialect.name,
+        q,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        cursor=after,
+        limit=limit
+    )
+    rows = (await db.execute(query)).all()
+
+    items = []
+    for row in rows:
+        items.append({
+            "id": row.id,
+            "vendor_id": row.vendor_id,
+            "name": row.name,
+            "description": row.description,
+            "price": float(row.price),
+            "stock": row.stock,
+            "image_url": row.image_url,
+            "score": float(row.score)
+        })
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(cursor_value(last, sort), last.id)
 
-    return query.all()
\ No newline at end of file
+    return {"items": items, "next_cursor": next_cursor}
\ No newline at end of file
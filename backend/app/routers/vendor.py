@@ -1,22 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
 
-from app.database import SessionLocal
-from app.models.product import Product
-from app.schemas.product_schema import CreateProductSchema, UpdateProductSchema
-from app.dependencies.role_checker import require_role
-from app.models.order import Order
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request, Header
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+from typing import List, Optional
+
+from app import config
+from app.database import get_db, get_async_db
+from app.models.product import Product, ProductStatus
+from app.schemas.product_schema import (
+    CreateProductSchema,
+    UpdateProductSchema,
+    ProductResponseSchema,
+    BulkUpsertResultSchema
+)
+from app.schemas.order_schema import (
+    VendorTransactionSchema,
+    VendorSalesSummarySchema,
+    BulkShippingStatusSchema,
+    BulkShippingStatusResultSchema
+)
+from app.dependencies.role_checker import require_role, require_role_async
+from app.utils.uploads import upload_format, iter_upload_rows, batched, validation_message
+from app.utils.outbox import add_events
+from app.utils.event_stream import event_broker, fetch_vendor_events, format_sse, resume_point
+from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
 
 router = APIRouter(prefix="/vendor", tags=["Vendor"])
 
+SHIPPING_STATUSES = ["received", "ready_for_shipping", "out_for_delivery"]
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def sku_taken(db: Session, vendor_id: int, sku: str) -> bool:
+    return db.query(Product.id).filter(
+        Product.vendor_id == vendor_id,
+        Product.sku == sku
+    ).first() is not None
 
 
 # Add Product
@@ -26,8 +50,12 @@ def add_product(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("vendor"))
 ):
+    if product_data.sku and sku_taken(db, current_user.id, product_data.sku):
+        raise HTTPException(status_code=400, detail="SKU already exists")
+
     new_product = Product(
         vendor_id=current_user.id,
+        sku=product_data.sku,
         name=product_data.name,
         description=product_data.description,
         price=product_data.price,
@@ -43,8 +71,90 @@ def add_product(
     return {"message": "Product added successfully"}
 
 
+# Bulk Upsert Products (CSV or NDJSON, keyed by SKU)
+@router.post("/bulk-upsert-products", response_model=BulkUpsertResultSchema)
+def bulk_upsert_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("vendor"))
+):
+    fmt = upload_format(file.filename, format)
+    created = 0
+    updated = 0
+    errors = []
+    seen = set()
+
+    for batch in batched(iter_upload_rows(file.file, fmt)):
+        skus = {
+            str(data["sku"]).strip()
+            for _, data, _ in batch
+            if data and data.get("sku")
+        }
+
+        # One lookup per batch for the SKUs that already exist
+        existing = dict(db.query(Product.sku, Product.id).filter(
+            Product.vendor_id == current_user.id,
+            Product.sku.in_(skus)
+        ).all()) if skus else {}
+
+        inserts = []
+        updates = []
+
+        for row_number, data, error in batch:
+            sku = str(data.get("sku") or "").strip() if data else None
+
+            if error:
+                errors.append({"row": row_number, "sku": sku, "error": error})
+                continue
+
+            if not sku:
+                errors.append({"row": row_number, "sku": None, "error": "sku is required"})
+                continue
+
+            if sku in seen:
+                errors.append({"row": row_number, "sku": sku, "error": "Duplicate sku in upload"})
+                continue
+
+            data["sku"] = sku
+
+            try:
+                if sku in existing:
+                    values = UpdateProductSchema(**data).dict(exclude_unset=True)
+                    if "status" in values:
+                        values["status"] = ProductStatus(values["status"])
+                    values["id"] = existing[sku]
+                    updates.append(values)
+                else:
+                    values = CreateProductSchema(**data).dict()
+                    values["vendor_id"] = current_user.id
+                    values["status"] = ProductStatus.available
+                    inserts.append(values)
+            except ValidationError as e:
+                errors.append({"row": row_number, "sku": sku, "error": validation_message(e)})
+                continue
+            except ValueError:
+                errors.append({"row": row_number, "sku": sku, "error": "Invalid status"})
+                continue
+
+            seen.add(sku)
+
+        # Multi-row INSERT for new SKUs, executemany UPDATE by primary key
+        # for existing ones; one commit per batch
+        if inserts:
+            db.execute(insert(Product), inserts)
+        if updates:
+            db.execute(update(Product), updates)
+        db.commit()
+
+        created += len(inserts)
+        updated += len(updates)
+
+    return {"created": created, "updated": updated, "errors": errors}
+
+
 #View Products
-@router.get("/my-products")
+@router.get("/my-products", response_model=List[ProductResponseSchema])
 def get_my_products(
     db: Session = Depends(get_db),
     current_user = Depends(require_role("vendor"))
@@ -72,6 +182,9 @@ def update_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    if product_data.sku and product_data.sku != product.sku and sku_taken(db, current_user.id, product_data.sku):
+        raise HTTPException(status_code=400, detail="SKU already exists")
+
     for key, value in product_data.dict(exclude_unset=True).items():
         setattr(product, key, value)
 
@@ -100,56 +213,106 @@ def delete_product(
 
     return {"message": "Product deleted successfully"}
 
-@router.get("/transactions")
+@router.get("/transactions", response_model=List[VendorTransactionSchema])
 def vendor_transactions(
+    after_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    status: Optional[OrderStatus] = None,
+    shipping_status: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user = Depends(require_role("vendor"))
 ):
-    # Get vendor's products
-    products = db.query(Product).filter(
+    # Single join over order items -> orders -> products, newest first.
+    # Pass the last order_item_id of a page as after_id to get the next one.
+    query = db.query(
+        OrderItem.id,
+        OrderItem.quantity,
+        OrderItem.price,
+        OrderItem.shipping_status,
+        Order.id.label("order_id"),
+        Order.name,
+        Order.email,
+        Order.phone,
+        Order.address,
+        Order.city,
+        Order.state,
+        Order.pincode,
+        Order.payment_method,
+        Order.status,
+        Order.created_at,
+        Product.name.label("product_name")
+    ).join(
+        Order, OrderItem.order_id == Order.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).filter(
         Product.vendor_id == current_user.id
-    ).all()
+    )
 
-    product_ids = [p.id for p in products]
+    if after_id:
+        query = query.filter(OrderItem.id < after_id)
 
-    if not product_ids:
-        return {"message": "No products found"}
+    if from_date:
+        query = query.filter(Order.created_at >= from_date)
 
-    # Get order items containing vendor products
-    order_items = db.query(OrderItem).filter(
-        OrderItem.product_id.in_(product_ids)
-    ).all()
+    if to_date:
+        query = query.filter(Order.created_at < to_date + timedelta(days=1))
 
-    result = []
+    if status:
+        query = query.filter(Order.status == status)
+
+    if shipping_status:
+        query = query.filter(OrderItem.shipping_status == shipping_status)
 
-    for item in order_items:
-        order = db.query(Order).filter(Order.id == item.order_id).first()
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+    rows = query.order_by(OrderItem.id.desc()).limit(limit).all()
+
+    result = []
 
+    for row in rows:
         result.append({
-            "order_item_id": item.id,
-            "order_id": order.id,
-
-            "customer_name": order.name,
-            "customer_email": order.email,
-            "customer_phone": order.phone,
-            "address": order.address,
-            "city": order.city,
-            "state": order.state,
-            "pincode": order.pincode,
-            "payment_method": order.payment_method,
-
-            "product_name": product.name,
-            "quantity": item.quantity,
-            "price": float(item.price),
-
-            "shipping_status": item.shipping_status,
-            "order_status": order.status,
-            "order_date": order.created_at
+            "order_item_id": row.id,
+            "order_id": row.order_id,
+
+            "customer_name": row.name,
+            "customer_email": row.email,
+            "customer_phone": row.phone,
+            "address": row.address,
+            "city": row.city,
+            "state": row.state,
+            "pincode": row.pincode,
+            "payment_method": row.payment_method,
+
+            "product_name": row.product_name,
+            "quantity": row.quantity,
+            "price": float(row.price),
+
+            "shipping_status": row.shipping_status,
+            "order_status": row.status,
+            "order_date": row.created_at
         })
 
     return result
 
+# Dashboard totals over all of the vendor's transactions, computed in SQL
+# so they don't depend on how many rows a /transactions page returns
+@router.get("/transactions/summary", response_model=VendorSalesSummarySchema)
+def vendor_sales_summary(
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("vendor"))
+):
+    sales, revenue = db.query(
+        func.count(OrderItem.id),
+        func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0)
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).filter(
+        Product.vendor_id == current_user.id
+    ).one()
+
+    return {"sales": sales, "revenue": float(revenue)}
+
 # Update Shipping Status
 @router.put("/update-status/{order_item_id}")
 def update_shipping_status(
@@ -174,18 +337,139 @@ def update_shipping_status(
     if not product:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    if new_status not in [
-        "received",
-        "ready_for_shipping",
-        "out_for_delivery"
-    ]:
+    if new_status not in SHIPPING_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
     order_item.shipping_status = new_status
+    add_events(db, [("shipping_status_changed", {
+        "order_item_id": order_item.id,
+        "order_id": order_item.order_id,
+        "vendor_id": current_user.id,
+        "shipping_status": new_status
+    })])
     db.commit()
+    event_broker.notify()
 
     return {"message": "Shipping status updated successfully"}
 
+# Update Shipping Status in bulk
+@router.put("/update-status", response_model=BulkShippingStatusResultSchema)
+def bulk_update_shipping_status(
+    data: BulkShippingStatusSchema,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("vendor"))
+):
+    if data.new_status not in SHIPPING_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+    ids = set(data.order_item_ids)
+    if not ids:
+        return {"updated": 0, "rejected": []}
+
+    # Ownership for every id in one join against Product.vendor_id
+    owned_items = db.execute(
+        select(OrderItem.id, OrderItem.order_id).join(
+            Product, OrderItem.product_id == Product.id
+        ).where(
+            OrderItem.id.in_(ids),
+            Product.vendor_id == current_user.id
+        )
+    ).all()
+    owned = {item.id for item in owned_items}
+
+    if owned:
+        db.execute(
+            update(OrderItem)
+            .where(OrderItem.id.in_(owned))
+            .values(shipping_status=data.new_status)
+            .execution_options(synchronize_session=False)
+        )
+        add_events(db, [
+            ("shipping_status_changed", {
+                "order_item_id": item.id,
+                "order_id": item.order_id,
+                "vendor_id": current_user.id,
+                "shipping_status": data.new_status
+            })
+            for item in owned_items
+        ])
+        db.commit()
+        event_broker.notify()
+
+    return {"updated": len(owned), "rejected": sorted(ids - owned)}
+
+# Live feed of new order items and shipping updates (server-sent events)
+@router.get("/stream")
+async def vendor_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role_async("vendor")),
+    last_event_id: Optional[str] = Header(None)
+):
+    vendor_id = current_user.id
+
+    # Don't pin a pooled connection for the lifetime of the stream
+    await db.close()
+
+    try:
+        resume_after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_after = None
+
+    async def event_source():
+        # Subscribe before replaying so nothing committed in between is lost;
+        # live copies of replayed events are skipped by id. Live events can
+        # arrive out of id order (late commits), so they are not filtered by
+        # the highest id sent.
+        queue = event_broker.subscribe(vendor_id)
+        replayed = set()
+        loop = asyncio.get_running_loop()
+        forget_replayed_at = None
+
+        try:
+            yield f"retry: {config.EVENT_STREAM_RETRY_MS}\n\n"
+
+            if resume_after is not None:
+                after = await resume_point(resume_after, vendor_id, config.EVENT_STREAM_GAP_GRACE)
+                while True:
+                    missed = await fetch_vendor_events(after, vendor_id)
+                    for event in missed:
+                        yield format_sse(event)
+                        replayed.add(event["id"])
+                        after = event["id"]
+                    if len(missed) < 500:
+                        break
+                # Live copies of replayed events arrive within the broker's
+                # poll and gap grace; after that the ids are no longer needed
+                forget_replayed_at = (
+                    loop.time() + config.EVENT_STREAM_GAP_GRACE + config.EVENT_STREAM_POLL_INTERVAL
+                )
+
+            while not await request.is_disconnected():
+                if replayed and loop.time() > forget_replayed_at:
+                    replayed.clear()
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), config.EVENT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                # Dropped as a slow consumer; the client resumes with Last-Event-ID
+                if event is None:
+                    break
+
+                if event["id"] not in replayed:
+                    yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(vendor_id, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Toggle Product Status
 @router.put("/toggle-status/{product_id}")
 def toggle_product_status(
@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
 
 
 class AddToCartSchema(BaseModel):
@@ -8,4 +10,30 @@ class AddToCartSchema(BaseModel):
 
 class UpdateQuantitySchema(BaseModel):
     cart_item_id: int
-    quantity: int
\ No newline at end of file
+    quantity: int
+
+
+class CartItemViewSchema(BaseModel):
+    cart_item_id: int
+    product_id: int
+    product_name: str
+    price: float
+    quantity: int
+    item_total: float
+    stock: Optional[int] = None
+    available: bool
+    reserved_until: Optional[datetime] = None
+
+
+class UnavailableCartItemSchema(BaseModel):
+    cart_item_id: int
+    product_id: int
+    product_name: str
+    reason: str
+    available_stock: Optional[int] = None
+
+
+class CartViewSchema(BaseModel):
+    items: List[CartItemViewSchema]
+    grand_total: float
+    unavailable_items: List[UnavailableCartItemSchema]
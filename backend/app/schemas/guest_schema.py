@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class GuestCreateSchema(BaseModel):
@@ -10,4 +10,35 @@ class GuestCreateSchema(BaseModel):
 class GuestUpdateSchema(BaseModel):
     name: str | None = None
     contact_number: str | None = None
-    email: EmailStr | None = None
\ No newline at end of file
+    email: EmailStr | None = None
+
+
+class GuestResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int | None = None
+    name: str
+    contact_number: str
+    email: str
+
+
+class GuestImportErrorSchema(BaseModel):
+    row: int
+    email: str | None = None
+    error: str
+
+
+class GuestImportResultSchema(BaseModel):
+    imported: int
+    duplicates: int
+    errors: list[GuestImportErrorSchema]
+
+
+class GuestBulkDeleteSchema(BaseModel):
+    ids: list[int]
+
+
+class GuestBulkDeleteResultSchema(BaseModel):
+    deleted: int
+    not_found: list[int]
@@ -1,5 +1,8 @@
 from pydantic import BaseModel
 from datetime import date
+from typing import List, Optional
+
+from app.models.membership import MembershipDuration, MembershipStatus
 
 
 class CreateMembershipSchema(BaseModel):
@@ -13,4 +16,28 @@ class ExtendMembershipSchema(BaseModel):
 
 
 class CancelMembershipSchema(BaseModel):
-    membership_id: int
\ No newline at end of file
+    membership_id: int
+
+
+class BatchExtendMembershipSchema(BaseModel):
+    membership_ids: List[int]
+    months: int = 6
+
+
+class BatchCancelMembershipSchema(BaseModel):
+    membership_ids: List[int]
+
+
+class BatchMembershipResultSchema(BaseModel):
+    updated: int
+    rejected: List[int]
+
+
+class MembershipResponseSchema(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    user_name: str
+    duration: MembershipDuration
+    start_date: date
+    end_date: date
+    status: MembershipStatus
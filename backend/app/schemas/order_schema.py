@@ -0,0 +1,84 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+
+from app.models.order import OrderStatus
+
+
+class OrderResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: Optional[int] = None
+    total_amount: float
+    status: OrderStatus
+    name: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    pincode: Optional[str] = None
+    phone: Optional[str] = None
+    payment_method: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class TransactionReportSchema(BaseModel):
+    order_id: int
+    user_id: Optional[int] = None
+    total_amount: float
+    status: OrderStatus
+    created_at: Optional[datetime] = None
+
+
+class OrderItemSummarySchema(BaseModel):
+    product_name: Optional[str] = None
+    quantity: int
+    price: float
+    shipping_status: Optional[str] = None
+
+
+class MyOrderSchema(BaseModel):
+    order_id: int
+    total_amount: float
+    order_status: OrderStatus
+    payment_method: Optional[str] = None
+    created_at: Optional[datetime] = None
+    items: List[OrderItemSummarySchema]
+
+
+class VendorTransactionSchema(BaseModel):
+    order_item_id: int
+    order_id: int
+
+    customer_name: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_phone: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    pincode: Optional[str] = None
+    payment_method: Optional[str] = None
+
+    product_name: str
+    quantity: int
+    price: float
+
+    shipping_status: Optional[str] = None
+    order_status: OrderStatus
+    order_date: Optional[datetime] = None
+
+
+class VendorSalesSummarySchema(BaseModel):
+    sales: int
+    revenue: float
+
+
+class BulkShippingStatusSchema(BaseModel):
+    order_item_ids: List[int]
+    new_status: str
+
+
+class BulkShippingStatusResultSchema(BaseModel):
+    updated: int
+    rejected: List[int]
@@ -1,8 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+
+from app.models.product import ProductStatus
 
 
 class CreateProductSchema(BaseModel):
+    sku: Optional[str] = None
     name: str
     description: Optional[str] = None
     price: float
@@ -11,9 +15,53 @@ class CreateProductSchema(BaseModel):
 
 
 class UpdateProductSchema(BaseModel):
+    sku: Optional[str] = None
     name: Optional[str] = None
     description: Optional[str] = None
     price: Optional[float] = None
     stock: Optional[int] = None
     status: Optional[str] = None
-    image_url: Optional[str] = None
\ No newline at end of file
+    image_url: Optional[str] = None
+
+
+class ProductResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    vendor_id: Optional[int] = None
+    sku: Optional[str] = None
+    name: str
+    description: Optional[str] = None
+    price: float
+    stock: Optional[int] = None
+    status: ProductStatus
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ProductSearchItemSchema(BaseModel):
+    id: int
+    vendor_id: Optional[int] = None
+    name: str
+    description: Optional[str] = None
+    price: float
+    stock: Optional[int] = None
+    image_url: Optional[str] = None
+    score: float
+
+
+class ProductSearchPageSchema(BaseModel):
+    items: List[ProductSearchItemSchema]
+    next_cursor: Optional[str] = None
+
+
+class BulkRowErrorSchema(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+
+class BulkUpsertResultSchema(BaseModel):
+    created: int
+    updated: int
+    errors: List[BulkRowErrorSchema]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+from app.models.user import UserRole
+
+
+class UserResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    email: str
+    role: UserRole
+    category: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
@@ -0,0 +1,193 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from sqlalchemy import select, func
+
+from app import config
+from app.database import AsyncSessionLocal
+from app.models.outbox_event import OutboxEvent
+
+
+# Vendor-facing events are the outbox rows that carry a vendor_id; their ids
+# double as SSE event ids, so a client can resume with Last-Event-ID.
+#
+# Ids are assigned at insert but rows only become visible at commit, so a
+# lower id can appear after a higher one. Readers therefore never treat "the
+# highest id so far" as a watermark without waiting out a grace window.
+
+def to_event(row) -> dict:
+    return {
+        "id": row.id,
+        "type": row.event_type,
+        "vendor_id": row.vendor_id,
+        "payload": json.loads(row.payload)
+    }
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['payload'])}\n\n"
+
+
+def events_after(after_id: int):
+    return select(
+        OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.vendor_id, OutboxEvent.payload
+    ).where(OutboxEvent.id > after_id)
+
+
+async def fetch_vendor_events(after_id: int, vendor_id: int = None, limit: int = 500):
+    query = events_after(after_id)
+
+    if vendor_id is None:
+        query = query.where(OutboxEvent.vendor_id.is_not(None))
+    else:
+        query = query.where(OutboxEvent.vendor_id == vendor_id)
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query.order_by(OutboxEvent.id).limit(limit))).all()
+    return [to_event(row) for row in rows]
+
+
+async def resume_point(last_event_id: int, vendor_id: int, grace: float) -> int:
+    # Replay from the first of the vendor's events created within the grace
+    # window before the client's last one: any of them may have committed
+    # after that event was sent. Clients skip ids they already have.
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(OutboxEvent.id, OutboxEvent.created_at)
+            .where(OutboxEvent.vendor_id == vendor_id, OutboxEvent.id <= last_event_id)
+            .order_by(OutboxEvent.id.desc())
+            .limit(500)
+        )).all()
+
+    if not rows or rows[0].created_at is None:
+        return last_event_id
+
+    start = last_event_id
+    oldest = rows[0].created_at - timedelta(seconds=grace)
+    for row in rows:
+        if row.created_at is None or row.created_at < oldest:
+            break
+        start = row.id - 1
+    return start
+
+
+class OutboxTail:
+    # Broker backend that tails outbox_events. Every worker tails the shared
+    # table, so events committed by any worker reach every worker's streams;
+    # notify() wakes the local tail right after a local commit instead of
+    # waiting for the next poll. Another backend (e.g. a message bus) only
+    # needs the same notify() and listen() methods.
+
+    def __init__(self, poll_interval: float, gap_grace: float, batch_size: int = 500):
+        self.poll_interval = poll_interval
+        self.gap_grace = gap_grace
+        self.batch_size = batch_size
+        self._loop = None
+        self._wake = None
+
+    def notify(self):
+        # Safe to call from sync routes running in the threadpool
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def listen(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+
+        # Every id <= cursor has been published or given up on; seen holds
+        # the published ids above it with when each was first seen
+        cursor = None
+        seen = {}
+
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    if cursor is None:
+                        cursor = await db.scalar(select(func.coalesce(func.max(OutboxEvent.id), 0)))
+                    # All rows, not only vendor events, so that an id missing
+                    # here is a real gap rather than an event for nobody
+                    rows = (await db.execute(
+                        events_after(cursor).order_by(OutboxEvent.id).limit(self.batch_size)
+                    )).all()
+            except Exception as e:
+                print(f"Event stream poll failed: {e}")
+                rows = []
+
+            now = self._loop.time()
+            fresh = [row for row in rows if row.id not in seen]
+            for row in fresh:
+                seen[row.id] = now
+            if seen:
+                cursor = self._advance(cursor, seen, now)
+
+            events = [to_event(row) for row in fresh if row.vendor_id is not None]
+            if events:
+                yield events
+            if fresh and len(rows) == self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _advance(self, cursor: int, seen: dict, now: float) -> int:
+        # Step over contiguous ids. A gap below a seen id may be a transaction
+        # that has not committed yet, so it is only skipped (as rolled back)
+        # once the row above it has been visible for the grace window.
+        for row_id in sorted(seen):
+            if row_id != cursor + 1 and now - seen[row_id] < self.gap_grace:
+                break
+            del seen[row_id]
+            cursor = row_id
+        return cursor
+
+
+class EventBroker:
+    # In-process pub/sub: fans events from the backend out to the vendor
+    # streams connected to this worker.
+
+    def __init__(self, backend, queue_size: int = 1000):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.subscribers = {}
+
+    def notify(self):
+        self.backend.notify()
+
+    def subscribe(self, vendor_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(vendor_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, vendor_id: int, queue: asyncio.Queue):
+        queues = self.subscribers.get(vendor_id)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[vendor_id]
+
+    def publish(self, event: dict):
+        for queue in list(self.subscribers.get(event["vendor_id"], ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog and end the stream; the
+                # client reconnects with Last-Event-ID and replays from the table
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                self.unsubscribe(event["vendor_id"], queue)
+
+    async def run(self):
+        async for events in self.backend.listen():
+            for event in events:
+                self.publish(event)
+
+
+event_broker = EventBroker(OutboxTail(
+    config.EVENT_STREAM_POLL_INTERVAL,
+    config.EVENT_STREAM_GAP_GRACE
+))
@@ -0,0 +1,58 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(session_factory, query, batch_size: int = STREAM_BATCH_SIZE):
+    # Owns its own session so the cursor outlives the request dependencies
+    # while the response body is still being sent.
+    db = session_factory()
+    try:
+        result = db.execute(query.execution_options(
+            stream_results=True,
+            yield_per=batch_size
+        ))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def stream_csv(partitions, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for partition in partitions:
+        for row in partition:
+            writer.writerow([_plain(row._mapping[c]) for c in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_ndjson(partitions, columns):
+    for partition in partitions:
+        yield "".join(
+            json.dumps({c: _plain(row._mapping[c]) for c in columns}) + "\n"
+            for row in partition
+        )
@@ -0,0 +1,101 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from app import config
+from app.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+
+def request_hash(data) -> str:
+    body = json.dumps(data.model_dump(mode="json"), sort_keys=True)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def find_key(db, user_id: int, key: str):
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key
+    ).first()
+
+
+def claim_idempotency_key(db, user_id: int, key: str, body_hash: str):
+    # Inserts the key at the start of the caller's transaction. It is only
+    # committed together with the response, so a failed request leaves the key
+    # free for a retry, and a concurrent duplicate waits on the unique index
+    # until the first one finishes. A record that already has a response is a
+    # replay; the caller should return replay_response() and do nothing else.
+    now = datetime.utcnow()
+    record = find_key(db, user_id, key)
+
+    if record and record.expires_at <= now:
+        db.delete(record)
+        db.flush()
+        record = None
+
+    if record is None:
+        record = IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=body_hash,
+            expires_at=now + timedelta(seconds=config.IDEMPOTENCY_KEY_TTL_SECONDS)
+        )
+        db.add(record)
+
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            record = find_key(db, user_id, key)
+
+            if record is None:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is already in progress"
+                )
+
+    if record.request_hash != body_hash:
+        db.rollback()
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request"
+        )
+
+    return record
+
+
+def store_response(record, status_code: int, body):
+    record.status_code = status_code
+    record.response_body = json.dumps(body)
+
+
+def replay_response(record):
+    return JSONResponse(
+        content=json.loads(record.response_body),
+        status_code=record.status_code,
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+
+def purge_expired_idempotency_keys(db) -> int:
+    result = db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.expires_at <= datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def sweep_expired_idempotency_keys():
+    db = SessionLocal()
+    try:
+        purged = purge_expired_idempotency_keys(db)
+    finally:
+        db.close()
+    return f"purged {purged} expired idempotency keys" if purged else None
@@ -0,0 +1,71 @@
+from sqlalchemy import update, func, case, literal_column
+
+from app.database import SessionLocal
+from app.models.membership import Membership, MembershipStatus
+
+
+def add_months(dialect: str, column, months: int):
+    # Date arithmetic done by the database so batch updates stay set-based
+    if dialect == "mysql":
+        return func.date_add(column, literal_column(f"INTERVAL {int(months)} MONTH"))
+    return func.date(column, f"{int(months):+d} months")
+
+
+def expire_memberships(db) -> int:
+    # One set-based UPDATE for every active membership past its end date
+    result = db.execute(
+        update(Membership)
+        .where(
+            Membership.status == MembershipStatus.active,
+            Membership.end_date < func.current_date()
+        )
+        .values(status=MembershipStatus.expired)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def extend_memberships(db, membership_ids, months: int) -> int:
+    new_end_date = add_months(db.get_bind().dialect.name, Membership.end_date, months)
+
+    result = db.execute(
+        update(Membership)
+        .where(
+            Membership.id.in_(membership_ids),
+            Membership.status != MembershipStatus.cancelled
+        )
+        # MySQL applies SET assignments left to right, so status must be
+        # computed while end_date still holds the old value
+        .ordered_values(
+            # Expired memberships come back to life if the new end date is current
+            (Membership.status, case(
+                (new_end_date >= func.current_date(), MembershipStatus.active),
+                else_=Membership.status
+            )),
+            (Membership.end_date, new_end_date)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def cancel_memberships(db, membership_ids) -> int:
+    result = db.execute(
+        update(Membership)
+        .where(Membership.id.in_(membership_ids))
+        .values(status=MembershipStatus.cancelled)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def sweep_expired_memberships():
+    db = SessionLocal()
+    try:
+        expired = expire_memberships(db)
+    finally:
+        db.close()
+    return f"expired {expired} memberships" if expired else None
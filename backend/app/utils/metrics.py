@@ -0,0 +1,167 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Per-request DB counters, shared by the request's task and the threadpool
+# thread a sync route runs in (both inherit the context).
+_request_db = ContextVar("request_db", default=None)
+
+
+class RequestDBStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+def _labels(labels: dict) -> str:
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsRegistry:
+    # Metrics for this worker process; each uvicorn worker exposes its own
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}       # (method, route, status) -> count
+        self.latency = {}        # (method, route) -> Histogram
+        self.db_queries = {}     # (method, route) -> Histogram of queries per request
+        self.db_seconds = {}     # (method, route) -> Histogram of DB time per request
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, db: RequestDBStats):
+        key = (method, route)
+
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.db_queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.db_seconds[key] = Histogram(LATENCY_BUCKETS)
+
+            self.latency[key].observe(seconds)
+            self.db_queries[key].observe(db.queries)
+            self.db_seconds[key].observe(db.seconds)
+
+    def _histogram_lines(self, name: str, help_text: str, histograms: dict):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = {"method": method, "route": route}
+            cumulative = 0
+
+            for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.total}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+        return lines
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total HTTP requests by route template and status code.",
+                "# TYPE http_requests_total counter"
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels({'method': method, 'route': route, 'status': status})} {count}")
+
+            lines += self._histogram_lines(
+                "http_request_duration_seconds",
+                "Time from request start to the end of the response body.",
+                self.latency
+            )
+            lines += self._histogram_lines(
+                "db_queries_per_request",
+                "Database statements executed while serving one request.",
+                self.db_queries
+            )
+            lines += self._histogram_lines(
+                "db_seconds_per_request",
+                "Time spent in database statements while serving one request.",
+                self.db_seconds
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def instrument_engine(engine):
+    # Counts statements and their time against the current request, if any.
+    # Statements outside a request (startup, background jobs) are ignored.
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_db.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += time.perf_counter() - context._metrics_started
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware, so streamed responses are timed to their last byte
+    # and the app is not wrapped in an extra task per request.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _request_db.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_db.reset(token)
+
+            # Label by route template, never the raw path, to keep cardinality bounded
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+                stats
+            )
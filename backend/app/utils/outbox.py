@@ -0,0 +1,153 @@
+import json
+import threading
+import urllib.request
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from app import config
+from app.models.outbox_event import OutboxEvent
+
+
+# Sinks receive one event dict at a time and raise on failure; the worker
+# retries failed events, so every sink must tolerate duplicates.
+
+class WebhookSink:
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: dict):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(event).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status >= 300:
+                raise RuntimeError(f"webhook returned {response.status}")
+
+
+class FileSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, event: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+
+class MemorySink:
+    # Local stand-in that keeps delivered events in memory
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def send(self, event: dict):
+        with self._lock:
+            self.events.append(event)
+
+
+def get_sink():
+    if config.OUTBOX_SINK == "webhook":
+        if not config.OUTBOX_WEBHOOK_URL:
+            raise RuntimeError("OUTBOX_WEBHOOK_URL must be set for the webhook sink")
+        return WebhookSink(config.OUTBOX_WEBHOOK_URL)
+    if config.OUTBOX_SINK == "file":
+        return FileSink(config.OUTBOX_FILE_PATH)
+    if config.OUTBOX_SINK == "memory":
+        return MemorySink()
+    raise RuntimeError(f"Unknown OUTBOX_SINK: {config.OUTBOX_SINK}")
+
+
+def add_events(db, events):
+    # Queues (event_type, payload) pairs in the caller's transaction, so they
+    # are committed or rolled back together with the change they describe.
+    now = datetime.utcnow()
+    db.execute(insert(OutboxEvent), [
+        {
+            "event_type": event_type,
+            "payload": json.dumps(payload),
+            "vendor_id": payload.get("vendor_id"),
+            "attempts": 0,
+            "next_attempt_at": now
+        }
+        for event_type, payload in events
+    ])
+
+
+def retry_delay(attempts: int) -> float:
+    return min(config.OUTBOX_RETRY_BASE * 2 ** (attempts - 1), config.OUTBOX_RETRY_MAX)
+
+
+def claim_batch(db, batch_size: int):
+    # Leases a batch by pushing next_attempt_at past the lease window. Another
+    # worker skips leased rows, and if this one dies they become due again.
+    now = datetime.utcnow()
+
+    rows = db.execute(
+        select(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.attempts)
+        .where(
+            OutboxEvent.delivered_at.is_(None),
+            OutboxEvent.next_attempt_at <= now
+        )
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if rows:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([row.id for row in rows]))
+            .values(next_attempt_at=now + timedelta(seconds=config.OUTBOX_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    return rows
+
+
+def drain_outbox(db, sink, batch_size: int = None) -> dict:
+    # Delivers one batch at least once; failures are rescheduled with
+    # exponential backoff.
+    rows = claim_batch(db, batch_size or config.OUTBOX_BATCH_SIZE)
+
+    delivered = []
+    failed = 0
+
+    for row in rows:
+        event = {
+            "id": row.id,
+            "type": row.event_type,
+            "payload": json.loads(row.payload)
+        }
+
+        try:
+            sink.send(event)
+            delivered.append(row.id)
+        except Exception as e:
+            failed += 1
+            attempts = row.attempts + 1
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == row.id)
+                .values(
+                    attempts=attempts,
+                    last_error=str(e)[:1000],
+                    next_attempt_at=datetime.utcnow() + timedelta(seconds=retry_delay(attempts))
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    if delivered:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(delivered))
+            .values(delivered_at=datetime.utcnow(), attempts=OutboxEvent.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    return {"claimed": len(rows), "delivered": len(delivered), "failed": failed}
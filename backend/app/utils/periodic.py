@@ -0,0 +1,14 @@
+import asyncio
+
+
+async def run_periodically(name: str, func, interval: float):
+    # Runs a blocking maintenance job on a worker thread every `interval`
+    # seconds. Jobs must be idempotent: every uvicorn worker runs its own loop.
+    while True:
+        try:
+            result = await asyncio.to_thread(func)
+            if result:
+                print(f"{name}: {result}")
+        except Exception as e:
+            print(f"{name} failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.checkouts = 0
+        self.checkins = 0
+
+    def start_wait(self):
+        with self._lock:
+            self.waiting += 1
+
+    def end_wait(self, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            self.waiting -= 1
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            data = {
+                "waiting": self.waiting,
+                "wait_count": self.wait_count,
+                "wait_time_avg_ms": (
+                    self.wait_time_total / self.wait_count * 1000
+                    if self.wait_count else 0.0
+                ),
+                "wait_time_max_ms": self.wait_time_max * 1000,
+                "timeouts": self.timeouts,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+            }
+
+        # Live counters straight from the pool (QueuePool only)
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+
+        return data
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _MeteredPoolMixin:
+    # QueuePool has no "before checkout" event, so time the acquire here to
+    # see how long requests queue for a connection.
+    metrics = pool_metrics
+
+    def _do_get(self):
+        self.metrics.start_wait()
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except Exception:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.end_wait(time.perf_counter() - start, timed_out)
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    metrics = pool_metrics
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+def attach_pool_metrics(engine, metrics=pool_metrics):
+    event.listen(engine.pool, "checkout", metrics.on_checkout)
+    event.listen(engine.pool, "checkin", metrics.on_checkin)
@@ -0,0 +1,111 @@
+import threading
+import time
+
+
+def parse_limit(limit: str):
+    # "10/60" -> bucket of 10 requests refilled over 60 seconds
+    count, seconds = limit.split("/")
+    return int(count), float(seconds)
+
+
+def take_token(state, capacity: int, rate: float, now: float):
+    # Token-bucket step. state is (tokens, updated_at) or None for a full
+    # bucket; returns (allowed, new_state, retry_after_seconds).
+    tokens, updated_at = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+    if tokens >= 1:
+        return True, (tokens - 1, now), 0
+    return False, (tokens, now), (1 - tokens) / rate
+
+
+class MemoryStore:
+    # Buckets in this process only; enough for a single worker. Policies
+    # share the store, so each bucket keeps the time it will be full again
+    # and pruning never needs the calling policy's capacity or rate.
+
+    def __init__(self, max_keys: int = 100000, prune_interval: float = 10.0):
+        self.max_keys = max_keys
+        self.prune_interval = prune_interval
+        self._buckets = {}
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float):
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._buckets.get(key)
+            allowed, state, retry_after = take_token(entry[0] if entry else None, capacity, rate, now)
+            self._buckets[key] = (state, now + (capacity - state[0]) / rate)
+
+            # At most one sweep per interval, however many takes go over
+            if len(self._buckets) > self.max_keys and now >= self._next_prune:
+                self._prune(now)
+                self._next_prune = now + self.prune_interval
+
+        return allowed, retry_after
+
+    def _prune(self, now: float):
+        # A bucket that has refilled completely is the same as no bucket
+        full = [key for key, (_, full_at) in self._buckets.items() if full_at <= now]
+        for key in full:
+            del self._buckets[key]
+
+
+class SharedStore:
+    # Buckets kept in a store shared by every worker. The client only needs
+    # two operations, which map onto Redis WATCH/MULTI or memcached gets/cas:
+    #   get(key) -> (value, cas_token)   value is None if missing
+    #   compare_and_set(key, value, cas_token, ttl) -> bool
+
+    def __init__(self, client, max_retries: int = 5):
+        self.client = client
+        self.max_retries = max_retries
+
+    def take(self, key: str, capacity: int, rate: float):
+        ttl = capacity / rate
+
+        for _ in range(self.max_retries):
+            now = time.time()
+            value, cas_token = self.client.get(key)
+            allowed, state, retry_after = take_token(value, capacity, rate, now)
+
+            if self.client.compare_and_set(key, state, cas_token, ttl):
+                return allowed, retry_after
+
+        # Heavy contention on one key: refuse rather than let it through
+        return False, 1 / rate
+
+
+class FakeSharedClient:
+    # In-process stand-in for a shared store client, for local runs and tests
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[2] <= time.time():
+                return None, None
+            return entry[0], entry[1]
+
+    def compare_and_set(self, key: str, value, cas_token, ttl: float) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            current = entry[1] if entry and entry[2] > time.time() else None
+            if current != cas_token:
+                return False
+            self._data[key] = (value, (current or 0) + 1, time.time() + ttl)
+            return True
+
+
+store = MemoryStore()
+
+
+def set_store(new_store):
+    # Multi-worker deployments swap in SharedStore(<client>) at startup
+    global store
+    store = new_store
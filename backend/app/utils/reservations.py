@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import aliased
+
+from app import config
+from app.database import SessionLocal
+from app.models.stock_reservation import StockReservation
+
+
+def reservation_expiry(now: datetime) -> datetime:
+    return now + timedelta(seconds=config.RESERVATION_TTL_SECONDS)
+
+
+def reserved_by_others(product_id, cart_item_id, now: datetime):
+    # Quantity held by other carts' active reservations. Product stock minus
+    # this is what can still be promised to this cart item. Aliased so it can
+    # be used as a correlated subquery next to a join on stock_reservations.
+    held = aliased(StockReservation)
+    query = select(
+        func.coalesce(func.sum(held.quantity), 0)
+    ).where(
+        held.product_id == product_id,
+        held.expires_at > now
+    )
+
+    if cart_item_id is not None:
+        query = query.where(held.cart_item_id != cart_item_id)
+
+    return query
+
+
+async def save_reservation(db, cart_item_id: int, product_id: int, quantity: int, now: datetime):
+    result = await db.execute(select(StockReservation).where(
+        StockReservation.cart_item_id == cart_item_id
+    ))
+    reservation = result.scalars().first()
+
+    if reservation:
+        reservation.quantity = quantity
+        reservation.expires_at = reservation_expiry(now)
+    else:
+        reservation = StockReservation(
+            cart_item_id=cart_item_id,
+            product_id=product_id,
+            quantity=quantity,
+            expires_at=reservation_expiry(now)
+        )
+        db.add(reservation)
+
+    return reservation
+
+
+def release_expired_reservations(db) -> int:
+    result = db.execute(
+        delete(StockReservation)
+        .where(StockReservation.expires_at <= datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def sweep_expired_reservations():
+    db = SessionLocal()
+    try:
+        released = release_expired_reservations(db)
+    finally:
+        db.close()
+    return f"released {released} expired stock reservations" if released else None
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, delete, insert
+from sqlalchemy.dialects import mysql, sqlite
+
+from app.models.daily_sales import DailySales
+from app.models.order import Order
+
+
+def record_sale(db, amount):
+    # Called inside the checkout transaction so the rollup can never drift
+    # from the orders table. Uses the database clock, like Order.created_at.
+    dialect = db.get_bind().dialect.name
+    values = {"day": func.current_date(), "order_count": 1, "revenue": amount}
+
+    if dialect == "mysql":
+        stmt = mysql.insert(DailySales).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            order_count=DailySales.order_count + 1,
+            revenue=DailySales.revenue + stmt.inserted.revenue
+        )
+    else:
+        stmt = sqlite.insert(DailySales).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySales.day],
+            set_={
+                "order_count": DailySales.order_count + 1,
+                "revenue": DailySales.revenue + stmt.excluded.revenue
+            }
+        )
+
+    db.execute(stmt)
+
+
+def recompute_daily_sales(conn):
+    # Backfill: recompute every day from the orders table in one statement.
+    # Takes a session or connection and leaves the commit to the caller.
+    day = func.date(Order.created_at)
+
+    conn.execute(delete(DailySales))
+    conn.execute(insert(DailySales).from_select(
+        ["day", "order_count", "revenue"],
+        select(day, func.count(Order.id), func.sum(Order.total_amount))
+        .where(Order.created_at.isnot(None))
+        .group_by(day)
+    ))
+
+
+def rebuild_daily_sales(db):
+    recompute_daily_sales(db)
+    db.commit()
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
@@ -0,0 +1,161 @@
+import base64
+import json
+import re
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import Table, Column, Integer, MetaData, select, literal_column, func, and_, or_, text
+from sqlalchemy.dialects.mysql import match
+
+from app.models.product import Product
+
+SORT_OPTIONS = ("relevance", "price_asc", "price_desc", "newest")
+
+# SQLite stand-in for the MySQL FULLTEXT index (external-content FTS5 table
+# kept in sync with products by triggers, see migrations)
+products_fts = Table(
+    "products_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True)
+)
+
+
+def create_fulltext_index(conn):
+    if conn.dialect.name == "mysql":
+        existing = {
+            row[2] for row in conn.execute(text("SHOW INDEX FROM products"))
+        }
+        if "ft_products_name_description" not in existing:
+            conn.execute(text(
+                "CREATE FULLTEXT INDEX ft_products_name_description "
+                "ON products (name, description)"
+            ))
+        return
+
+    conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+        "name, description, content='products', content_rowid='id')"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ))
+    conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+
+
+def has_search_terms(q: str) -> bool:
+    return re.search(r"\w", q) is not None
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every word so user input can never be parsed as FTS5 syntax;
+    # the trailing * gives prefix matching for search-as-you-type.
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def encode_cursor(value, last_id: int) -> str:
+    if isinstance(value, Decimal):
+        value = str(value)
+    raw = json.dumps([value, last_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, sort: str):
+    # Cursors come back from clients, so anything encode_cursor could not have
+    # produced for this sort raises ValueError or TypeError (a 400 upstream)
+    value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+    if sort in ("price_asc", "price_desc"):
+        if not isinstance(value, str):
+            raise TypeError("price cursor must be a decimal string")
+        try:
+            value = Decimal(value)
+        except InvalidOperation:
+            raise ValueError("price cursor must be a decimal string")
+        if not value.is_finite():
+            raise ValueError("price cursor must be finite")
+    elif sort == "relevance":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError("relevance cursor must be a number")
+
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        raise TypeError("cursor id must be an integer")
+    return value, last_id
+
+
+def search_products_query(dialect: str, q: str, min_price=None, max_price=None,
+                          sort: str = "relevance", cursor=None, limit: int = 20):
+    if dialect == "mysql":
+        score = match(Product.name, Product.description, against=q)
+        ranked = select(Product, score.label("score")).where(score > 0)
+    else:
+        fts = literal_column("products_fts")
+        ranked = select(
+            Product, (-func.bm25(fts)).label("score")
+        ).join(
+            products_fts, products_fts.c.rowid == Product.id
+        ).where(fts.op("MATCH")(_fts5_query(q)))
+
+    ranked = ranked.where(Product.status == "available")
+
+    if min_price is not None:
+        ranked = ranked.where(Product.price >= min_price)
+
+    if max_price is not None:
+        ranked = ranked.where(Product.price <= max_price)
+
+    # Rank in a subquery so the cursor can compare against the score column
+    sub = ranked.subquery()
+    query = select(sub)
+
+    if cursor:
+        value, last_id = cursor
+        if sort == "relevance":
+            query = query.where(or_(
+                sub.c.score < value,
+                and_(sub.c.score == value, sub.c.id > last_id)
+            ))
+        elif sort == "price_asc":
+            query = query.where(or_(
+                sub.c.price > value,
+                and_(sub.c.price == value, sub.c.id > last_id)
+            ))
+        elif sort == "price_desc":
+            query = query.where(or_(
+                sub.c.price < value,
+                and_(sub.c.price == value, sub.c.id > last_id)
+            ))
+        else:
+            query = query.where(sub.c.id < last_id)
+
+    if sort == "relevance":
+        query = query.order_by(sub.c.score.desc(), sub.c.id)
+    elif sort == "price_asc":
+        query = query.order_by(sub.c.price, sub.c.id)
+    elif sort == "price_desc":
+        query = query.order_by(sub.c.price.desc(), sub.c.id)
+    else:
+        query = query.order_by(sub.c.id.desc())
+
+    return query.limit(limit)
+
+
+def cursor_value(row, sort: str):
+    if sort == "relevance":
+        return row.score
+    if sort in ("price_asc", "price_desc"):
+        return row.price
+    return None
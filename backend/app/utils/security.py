@@ -1,6 +1,19 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+from app import config
+
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__rounds=config.HASH_ROUNDS
+)
 
 
 def hash_password(passwords: str) -> str:
@@ -8,4 +21,100 @@ def hash_password(passwords: str) -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    # Runs hash_password/verify_password off the request path in a bounded
+    # process pool so bursts of logins do not starve other requests. start()
+    # is called from the app lifespan; until then (or with workers=0) the
+    # work goes to the default thread pool.
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.calls = 0
+        self.time_total = 0.0
+        self.time_max = 0.0
+
+    def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        # spawn, not fork: forking the running server would copy its threads'
+        # held locks (logging, the DB pools, the event loop) into the workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        # Start the worker processes now rather than on the first login
+        self._executor.submit(int)
+
+    async def _run(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server busy, please try again",
+                    headers={"Retry-After": "1"}
+                )
+            self.pending += 1
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.pending -= 1
+                self.calls += 1
+                self.time_total += elapsed
+                self.time_max = max(self.time_max, elapsed)
+
+    async def hash(self, passwords: str) -> str:
+        return await self._run(hash_password, passwords)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": config.HASH_ROUNDS,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "rejected": self.rejected,
+                "calls": self.calls,
+                "time_avg_ms": (
+                    self.time_total / self.calls * 1000 if self.calls else 0.0
+                ),
+                "time_max_ms": self.time_max * 1000,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(config.HASH_WORKERS, config.HASH_MAX_PENDING)
+
+
+async def hash_password_async(passwords: str, db=None) -> str:
+    # For request handlers: closes the caller's session first so its
+    # connection is not held while the hash runs in the pool. Raises 503
+    # when the pool is saturated.
+    if db is not None:
+        await db.close()
+    return await password_hasher.hash(passwords)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str, db=None) -> bool:
+    if db is not None:
+        await db.close()
+    return await password_hasher.verify(plain_password, hashed_password)
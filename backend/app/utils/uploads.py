@@ -0,0 +1,63 @@
+import codecs
+import csv
+import json
+
+# Rows written per multi-row INSERT/UPDATE by the bulk upload endpoints
+UPLOAD_BATCH_SIZE = 500
+
+
+def upload_format(filename: str, requested: str = None) -> str:
+    if requested:
+        return requested
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_upload_rows(fileobj, fmt: str):
+    # Decodes the upload incrementally so large files are never read into
+    # memory at once. Yields (row_number, data, error) per record.
+    lines = codecs.iterdecode(fileobj, "utf-8-sig")
+
+    if fmt == "ndjson":
+        for row_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield row_number, None, "Invalid JSON"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Each line must be a JSON object"
+                continue
+            yield row_number, data, None
+        return
+
+    reader = csv.DictReader(lines)
+    for row_number, row in enumerate(reader, start=1):
+        # Empty CSV cells mean "not provided"
+        data = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip() != ""
+        }
+        yield row_number, data, None
+
+
+def validation_message(error) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def batched(rows, size: int = UPLOAD_BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
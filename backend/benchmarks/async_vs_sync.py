@@ -0,0 +1,151 @@
+"""Throughput of the async /user/products route against a sync twin of it.
+
+Starts uvicorn on a seeded database and fires TOTAL requests at each route
+with CONCURRENCY connections open at once. Run from backend/:
+
+    python benchmarks/async_vs_sync.py [--concurrency 500] [--total 5000]
+
+Set BENCH_DATABASE_URL to benchmark against MySQL instead of a temporary
+SQLite file; the database must be empty or disposable.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--concurrency", type=int, default=500)
+parser.add_argument("--total", type=int, default=5000)
+parser.add_argument("--products", type=int, default=50)
+parser.add_argument("--port", type=int, default=8799)
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = os.getenv(
+    "BENCH_DATABASE_URL",
+    f"sqlite:///{tempfile.mkdtemp(prefix='bench_')}/bench.db"
+)
+os.environ.update({
+    "RATE_LIMIT_ENABLED": "false",
+    "METRICS_ENABLED": "false",
+    "HASH_WORKERS": "0",
+    "MEMBERSHIP_SWEEP_INTERVAL": "0",
+    "RESERVATION_SWEEP_INTERVAL": "0",
+    "IDEMPOTENCY_PURGE_INTERVAL": "0"
+})
+
+try:
+    import httpx
+    from app.database import engine, SessionLocal
+    from app.migrations import migrate
+    from app.models.user import User
+    from app.models.product import Product
+    from app.utils.token import create_access_token
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+
+def seed():
+    migrate(engine)
+    db = SessionLocal()
+    try:
+        vendor = User(name="bench vendor", email="bench-vendor@example.com", passwords="x", role="vendor", category="catering")
+        user = User(name="bench user", email="bench-user@example.com", passwords="x", role="user")
+        db.add_all([vendor, user])
+        db.flush()
+        db.add_all([
+            Product(vendor_id=vendor.id, name=f"Product {i}", description="bench", price=10, stock=100)
+            for i in range(args.products)
+        ])
+        db.commit()
+        return create_access_token({"user_id": user.id, "role": "user"})
+    finally:
+        db.close()
+
+
+async def hammer(url: str, token: str):
+    latencies = []
+    errors = 0
+    remaining = iter(range(args.total))
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=120, headers={"Authorization": f"Bearer {token}"}) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "req_per_s": args.total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors
+    }
+
+
+def port_in_use(port: int) -> bool:
+    with socket.socket() as sock:
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+def wait_for_server(base: str, server):
+    for _ in range(100):
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited; is port {args.port} already in use?")
+        try:
+            httpx.get(base + "/")
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+if __name__ == "__main__":
+    # A leftover server on the port would answer instead of ours
+    if port_in_use(args.port):
+        print(f"Port {args.port} is already in use")
+        sys.exit(1)
+
+    token = seed()
+    base = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_app:app", "--port", str(args.port),
+         "--log-level", "critical", "--backlog", str(max(2048, args.concurrency * 2))],
+        env=os.environ.copy()
+    )
+    try:
+        wait_for_server(base, server)
+        print(f"{args.total} requests, {args.concurrency} concurrent, {args.products} products per response")
+        for name, path in (("sync ", "/bench/sync/products"), ("async", "/user/products")):
+            asyncio.run(hammer(base + path, token))  # warm-up pass fills the pools
+            result = asyncio.run(hammer(base + path, token))
+            print(
+                f"{name}: {result['req_per_s']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}"
+            )
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
@@ -0,0 +1,18 @@
+# The app plus a sync twin of /user/products, for comparing the two paths
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.database import get_db
+from app.models.product import Product
+from app.dependencies.role_checker import require_role
+from app.schemas.product_schema import ProductResponseSchema
+from typing import List
+
+
+@app.get("/bench/sync/products", response_model=List[ProductResponseSchema])
+def sync_view_products(
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role("user"))
+):
+    return db.query(Product).filter(Product.status == "available").all()
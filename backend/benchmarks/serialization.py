@@ -0,0 +1,71 @@
+"""Time to serialize 10k products: raw ORM rows through jsonable_encoder (the
+old path, with no response_model) against the typed response schema. Run from
+backend/:
+
+    python benchmarks/serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+sys.path.append(os.getcwd())
+
+try:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from app.models.product import Product
+    from app.schemas.product_schema import ProductResponseSchema
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+
+def make_rows(count: int):
+    now = datetime.utcnow()
+    return [
+        Product(
+            id=i,
+            vendor_id=i % 50,
+            sku=f"SKU-{i}",
+            name=f"Product {i}",
+            description="A reasonably long product description " * 3,
+            price=Decimal("199.99"),
+            stock=i % 100,
+            status="available",
+            image_url=f"https://example.com/{i}.jpg",
+            created_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        times.append(time.perf_counter() - start)
+    return min(times), len(body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(List[ProductResponseSchema])
+
+    before, before_size = best_of(args.repeat, lambda: json.dumps(jsonable_encoder(rows)).encode())
+    after, after_size = best_of(args.repeat, lambda: adapter.dump_json(adapter.validate_python(rows)))
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"jsonable_encoder(ORM) + json.dumps: {before * 1000:8.1f} ms  ({before_size} bytes)")
+    print(f"response schema (pydantic-core):    {after * 1000:8.1f} ms  ({after_size} bytes)")
+    print(f"speedup: {before / after:.1f}x")
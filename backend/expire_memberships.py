@@ -0,0 +1,20 @@
+import sys
+import os
+
+# Add current directory to path so it can find 'app'
+sys.path.append(os.getcwd())
+
+try:
+    from app.database import SessionLocal
+    from app.utils.memberships import expire_memberships
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        expired = expire_memberships(db)
+    finally:
+        db.close()
+    print(f"Expired {expired} memberships.")
@@ -0,0 +1,16 @@
+import sys
+import os
+
+# Add current directory to path so it can find 'app'
+sys.path.append(os.getcwd())
+
+try:
+    from app.database import engine
+    from app.migrations import migrate
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    version = migrate(engine)
+    print(f"Database schema is at version {version}.")
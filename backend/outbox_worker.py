@@ -0,0 +1,40 @@
+import sys
+import os
+import time
+
+# Add current directory to path so it can find 'app'
+sys.path.append(os.getcwd())
+
+try:
+    from app import config
+    from app.database import SessionLocal
+    from app.utils.outbox import get_sink, drain_outbox
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    # Pass --once to drain what is due and exit (e.g. from cron)
+    once = "--once" in sys.argv[1:]
+    sink = get_sink()
+    print(f"Outbox worker delivering to {config.OUTBOX_SINK} sink...")
+
+    while True:
+        db = SessionLocal()
+        try:
+            result = drain_outbox(db, sink)
+        except Exception as e:
+            print(f"Outbox drain failed: {e}")
+            result = None
+        finally:
+            db.close()
+
+        if result and result["claimed"]:
+            print(f"Delivered {result['delivered']} events, {result['failed']} failed.")
+
+        # Keep going while full batches come back; otherwise wait for more
+        if result and result["claimed"] == config.OUTBOX_BATCH_SIZE:
+            continue
+        if once:
+            break
+        time.sleep(config.OUTBOX_POLL_INTERVAL)
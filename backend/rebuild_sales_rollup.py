@@ -0,0 +1,21 @@
+import sys
+import os
+
+# Add current directory to path so it can find 'app'
+sys.path.append(os.getcwd())
+
+try:
+    from app.database import SessionLocal
+    from app.utils.sales_rollup import rebuild_daily_sales
+except ImportError as e:
+    print(f"Import error: {e}")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    print("Rebuilding daily_sales from orders...")
+    db = SessionLocal()
+    try:
+        rebuild_daily_sales(db)
+    finally:
+        db.close()
+    print("Rebuild complete.")
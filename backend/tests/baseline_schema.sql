@@ -0,0 +1,106 @@
+-- Schema produced by the original models' create_all (SQLite), before any
+-- migration existed. Used to check that legacy databases migrate cleanly.
+
+CREATE TABLE users (
+	id INTEGER NOT NULL,
+	name VARCHAR(100) NOT NULL,
+	email VARCHAR(150) NOT NULL,
+	passwords VARCHAR(255) NOT NULL,
+	role VARCHAR(6) NOT NULL,
+	category VARCHAR(50),
+	image_url VARCHAR(255),
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY (id),
+	UNIQUE (email)
+);
+CREATE INDEX ix_users_id ON users (id);
+
+CREATE TABLE carts (
+	id INTEGER NOT NULL,
+	user_id INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (user_id),
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_carts_id ON carts (id);
+
+CREATE TABLE guests (
+	id INTEGER NOT NULL,
+	user_id INTEGER,
+	name VARCHAR(100) NOT NULL,
+	contact_number VARCHAR(20) NOT NULL,
+	email VARCHAR(150) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_guests_id ON guests (id);
+
+CREATE TABLE memberships (
+	id INTEGER NOT NULL,
+	user_id INTEGER,
+	duration VARCHAR(10),
+	start_date DATE NOT NULL,
+	end_date DATE NOT NULL,
+	status VARCHAR(9),
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_memberships_id ON memberships (id);
+
+CREATE TABLE orders (
+	id INTEGER NOT NULL,
+	user_id INTEGER,
+	total_amount DECIMAL(10, 2) NOT NULL,
+	status VARCHAR(9),
+	name VARCHAR(100),
+	email VARCHAR(150),
+	address VARCHAR(255),
+	city VARCHAR(100),
+	state VARCHAR(100),
+	pincode VARCHAR(20),
+	phone VARCHAR(20),
+	payment_method VARCHAR(50),
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_orders_id ON orders (id);
+
+CREATE TABLE products (
+	id INTEGER NOT NULL,
+	vendor_id INTEGER,
+	name VARCHAR(150) NOT NULL,
+	description VARCHAR(500),
+	price DECIMAL(10, 2) NOT NULL,
+	stock INTEGER,
+	status VARCHAR(12),
+	image_url VARCHAR(255),
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY (id),
+	FOREIGN KEY(vendor_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_products_id ON products (id);
+
+CREATE TABLE cart_items (
+	id INTEGER NOT NULL,
+	cart_id INTEGER,
+	product_id INTEGER,
+	quantity INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(cart_id) REFERENCES carts (id) ON DELETE CASCADE,
+	FOREIGN KEY(product_id) REFERENCES products (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_cart_items_id ON cart_items (id);
+
+CREATE TABLE order_items (
+	id INTEGER NOT NULL,
+	order_id INTEGER,
+	product_id INTEGER,
+	quantity INTEGER NOT NULL,
+	price DECIMAL(10, 2) NOT NULL,
+	shipping_status VARCHAR(50),
+	PRIMARY KEY (id),
+	FOREIGN KEY(order_id) REFERENCES orders (id) ON DELETE CASCADE,
+	FOREIGN KEY(product_id) REFERENCES products (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_order_items_id ON order_items (id);
@@ -0,0 +1,117 @@
+import itertools
+import os
+import tempfile
+
+# Configure the app before it is imported: a throwaway SQLite database,
+# hashing on threads and no background jobs or rate limits.
+_tmpdir = tempfile.mkdtemp(prefix="event_management_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ.setdefault("HASH_WORKERS", "0")
+os.environ.setdefault("HASH_ROUNDS", "1000")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+for name in ("MEMBERSHIP_SWEEP_INTERVAL", "RESERVATION_SWEEP_INTERVAL", "IDEMPOTENCY_PURGE_INTERVAL"):
+    os.environ.setdefault(name, "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import engine, SessionLocal
+from app.migrations import migrate
+from app.models.user import User
+from app.models.product import Product
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+from app.utils.security import hash_password
+from app.utils.token import create_access_token
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    migrate(engine)
+    from app.main import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def auth_headers(user_id: int, role: str) -> dict:
+    token = create_access_token({"user_id": user_id, "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_user(db):
+    def make_user(role="user", category=None, password="password"):
+        n = next(_ids)
+        user = User(
+            name=f"{role}{n}",
+            email=f"{role}{n}@example.com",
+            passwords=hash_password(password),
+            role=role,
+            category=category
+        )
+        db.add(user)
+        db.commit()
+        return user, auth_headers(user.id, role)
+    return make_user
+
+
+@pytest.fixture
+def make_product(db):
+    def make_product(vendor, stock=10, price=10, name=None, status="available"):
+        product = Product(
+            vendor_id=vendor.id,
+            name=name or f"Product {next(_ids)}",
+            description="test product",
+            price=price,
+            stock=stock,
+            status=status
+        )
+        db.add(product)
+        db.commit()
+        return product
+    return make_product
+
+
+@pytest.fixture
+def fill_cart(db):
+    # Puts items straight into a user's cart, bypassing /cart/add and its
+    # stock reservations
+    def fill_cart(user, *items):
+        cart = db.query(Cart).filter(Cart.user_id == user.id).first()
+        if not cart:
+            cart = Cart(user_id=user.id)
+            db.add(cart)
+            db.flush()
+        for product, quantity in items:
+            db.add(CartItem(cart_id=cart.id, product_id=product.id, quantity=quantity))
+        db.commit()
+        return cart
+    return fill_cart
+
+
+CHECKOUT = {
+    "name": "Test User",
+    "email": "buyer@example.com",
+    "address": "1 Main St",
+    "city": "Pune",
+    "state": "MH",
+    "pincode": "411001",
+    "phone": "9999999999",
+    "payment_method": "cash"
+}
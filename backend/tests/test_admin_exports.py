@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.models.order import Order
+
+# Orders dated in a year nothing else writes to; each test still filters to
+# its own ids because the session database is shared
+YEAR = {"from": "2001-01-01", "to": "2001-12-31"}
+
+
+@pytest.fixture
+def old_orders(db, make_user):
+    buyer, _ = make_user()
+    orders = [
+        Order(user_id=buyer.id, total_amount=amount, status="pending", name="Export Buyer",
+              email="export@example.com", payment_method="cash", created_at=datetime(2001, 3, day))
+        for day, amount in ((1, "12.50"), (2, "7.25"))
+    ]
+    db.add_all(orders)
+    db.commit()
+    return orders
+
+
+def test_export_csv(client, make_user, old_orders):
+    _, headers = make_user("admin")
+
+    response = client.get("/admin/transactions/export", params=YEAR, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    ids = {o.id for o in old_orders}
+    rows = [row for row in csv.DictReader(io.StringIO(response.text)) if int(row["order_id"]) in ids]
+    assert [int(row["order_id"]) for row in rows] == [o.id for o in old_orders]
+    assert [row["total_amount"] for row in rows] == ["12.50", "7.25"]
+    assert rows[0]["status"] == "pending"
+
+
+def test_export_ndjson(client, make_user, old_orders):
+    _, headers = make_user("admin")
+
+    response = client.get(
+        "/admin/transactions/export",
+        params={**YEAR, "format": "ndjson", "to": "2001-03-01"},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    ids = {o.id for o in old_orders}
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert all(line["created_at"].startswith("2001-03-01") for line in lines)
+    lines = [line for line in lines if line["order_id"] in ids]
+    assert [line["order_id"] for line in lines] == [old_orders[0].id]
+
+
+def test_export_rejects_unknown_format_and_non_admins(client, make_user):
+    _, admin_headers = make_user("admin")
+    _, user_headers = make_user()
+
+    response = client.get("/admin/transactions/export", params={"format": "xml"}, headers=admin_headers)
+    assert response.status_code == 422
+
+    assert client.get("/admin/transactions/export", headers=user_headers).status_code == 403
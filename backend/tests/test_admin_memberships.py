@@ -0,0 +1,43 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.membership import Membership
+
+# A window of end dates no other test uses
+WINDOW = {"expires_from": "2090-01-01", "expires_to": "2090-12-31"}
+
+
+def test_memberships_page_across_boundaries(client, db, make_user):
+    _, admin_headers = make_user("admin")
+    vendor, _ = make_user("vendor", "catering")
+
+    # Several memberships share each end date, so pages split inside a tie
+    memberships = [
+        Membership(user_id=vendor.id, start_date=date(2089, 1, 1),
+                   end_date=date(2090, 1, 1) + timedelta(days=i % 4))
+        for i in range(12)
+    ]
+    db.add_all(memberships)
+    db.commit()
+    expected = [m.id for m in sorted(memberships, key=lambda m: (m.end_date, m.id))]
+
+    seen = []
+    params = {**WINDOW, "limit": 5}
+    while True:
+        page = client.get("/admin/memberships", params=params, headers=admin_headers).json()
+        seen += [row["id"] for row in page]
+        if len(page) < 5:
+            break
+        params.update(after_end_date=page[-1]["end_date"], after_id=page[-1]["id"])
+
+    assert seen == expected
+
+
+@pytest.mark.parametrize("half", [{"after_id": 1}, {"after_end_date": "2090-01-01"}])
+def test_half_a_cursor_is_rejected(client, make_user, half):
+    _, admin_headers = make_user("admin")
+
+    response = client.get("/admin/memberships", params=half, headers=admin_headers)
+
+    assert response.status_code == 400
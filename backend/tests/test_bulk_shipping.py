@@ -0,0 +1,54 @@
+from app.models.order_item import OrderItem
+from app.models.outbox_event import OutboxEvent
+
+from test_my_orders import place_orders
+
+
+def test_bulk_update_changes_own_items_and_rejects_others(client, db, make_user, make_product):
+    vendor, headers = make_user("vendor", "catering")
+    other_vendor, _ = make_user("vendor", "catering")
+    buyer, _ = make_user()
+    mine, theirs = make_product(vendor), make_product(other_vendor)
+    place_orders(db, buyer, [mine, theirs], 2)
+
+    own_ids = [i.id for i in db.query(OrderItem).filter(OrderItem.product_id == mine.id)]
+    other_ids = [i.id for i in db.query(OrderItem).filter(OrderItem.product_id == theirs.id)]
+    last_event = db.query(OutboxEvent.id).order_by(OutboxEvent.id.desc()).scalar() or 0
+
+    response = client.put(
+        "/vendor/update-status",
+        json={"order_item_ids": own_ids + other_ids, "new_status": "out_for_delivery"},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "rejected": sorted(other_ids)}
+
+    db.expire_all()
+    statuses = dict(db.query(OrderItem.id, OrderItem.shipping_status).filter(
+        OrderItem.id.in_(own_ids + other_ids)
+    ).all())
+    assert {statuses[i] for i in own_ids} == {"out_for_delivery"}
+    assert {statuses[i] for i in other_ids} == {"received"}
+
+    # One shipping_status_changed event per updated item
+    events = db.query(OutboxEvent).filter(OutboxEvent.id > last_event).all()
+    assert sorted(e.event_type for e in events) == ["shipping_status_changed"] * 2
+
+
+def test_bulk_update_rejects_unknown_status(client, db, make_user, make_product):
+    vendor, headers = make_user("vendor", "catering")
+    buyer, _ = make_user()
+    product = make_product(vendor)
+    place_orders(db, buyer, [product], 1)
+    item = db.query(OrderItem).filter(OrderItem.product_id == product.id).one()
+
+    response = client.put(
+        "/vendor/update-status",
+        json={"order_item_ids": [item.id], "new_status": "lost"},
+        headers=headers
+    )
+
+    assert response.status_code == 400
+    db.refresh(item)
+    assert item.shipping_status == "received"
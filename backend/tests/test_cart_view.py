@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+
+def test_cart_totals_are_exact_and_flag_unavailable_items(client, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    cheap = make_product(vendor, price=Decimal("0.10"))
+    low_stock = make_product(vendor, stock=1, price=Decimal("0.20"))
+    withdrawn = make_product(vendor, status="out_of_stock")
+    user, headers = make_user()
+    fill_cart(user, (cheap, 3), (low_stock, 2), (withdrawn, 1))
+
+    response = client.get("/cart/my-cart", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    # 0.1 * 3 in binary floating point would come back as 0.30000000000000004
+    assert [item["item_total"] for item in body["items"]] == [0.3, 0.4, 10.0]
+    assert body["grand_total"] == 10.7
+    assert [item["available"] for item in body["items"]] == [True, False, False]
+    assert [
+        (item["product_id"], item["reason"], item["available_stock"])
+        for item in body["unavailable_items"]
+    ] == [(low_stock.id, "insufficient_stock", 1), (withdrawn.id, "unavailable", 10)]
+
+
+def test_empty_cart_and_non_buyers(client, make_user):
+    _, headers = make_user()
+    _, vendor_headers = make_user("vendor", "catering")
+
+    response = client.get("/cart/my-cart", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "grand_total": 0, "unavailable_items": []}
+
+    assert client.get("/cart/my-cart", headers=vendor_headers).status_code == 403
+
+
+def test_product_listing_filters_by_vendor_and_category(client, make_user, make_product):
+    florist, _ = make_user("vendor", "florist-listing")
+    caterer, _ = make_user("vendor", "catering")
+    roses = make_product(florist)
+    make_product(florist, status="out_of_stock")
+    cake = make_product(caterer)
+    _, headers = make_user()
+
+    by_vendor = client.get("/user/products", params={"vendor_id": florist.id}, headers=headers)
+    assert by_vendor.status_code == 200
+    assert [p["id"] for p in by_vendor.json()] == [roses.id]
+
+    by_category = client.get("/user/products", params={"category": "florist-listing"}, headers=headers)
+    assert [p["id"] for p in by_category.json()] == [roses.id]
+    assert cake.id not in [p["id"] for p in by_category.json()]
+
+    both = client.get("/user/products", params={"vendor_id": caterer.id, "category": "florist-listing"}, headers=headers)
+    assert both.json() == []
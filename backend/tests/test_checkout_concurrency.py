@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+
+from conftest import CHECKOUT
+
+BUYERS = 200
+STOCK = 50
+
+
+def test_parallel_checkouts_never_oversell(client, db, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=STOCK)
+
+    buyers = []
+    for _ in range(BUYERS):
+        user, headers = make_user()
+        fill_cart(user, (product, 1))
+        buyers.append(headers)
+
+    def checkout(headers):
+        return client.post("/orders/checkout", json=CHECKOUT, headers=headers).status_code
+
+    with ThreadPoolExecutor(max_workers=BUYERS) as pool:
+        statuses = list(pool.map(checkout, buyers))
+
+    db.expire_all()
+    sold = db.query(OrderItem).filter(OrderItem.product_id == product.id).count()
+
+    assert statuses.count(200) == STOCK
+    assert statuses.count(400) == BUYERS - STOCK
+    assert sold == STOCK
+    assert db.get(Product, product.id).stock == 0
+    assert db.query(Order).join(OrderItem).filter(OrderItem.product_id == product.id).count() == STOCK
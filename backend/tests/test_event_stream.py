@@ -0,0 +1,91 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from app.database import engine
+from app.models.outbox_event import OutboxEvent
+from app.utils import event_stream
+from app.utils.event_stream import OutboxTail, resume_point
+
+
+def latest_id():
+    with engine.connect() as conn:
+        return conn.scalar(select(func.coalesce(func.max(OutboxEvent.id), 0)))
+
+
+def add_event(event_id, vendor_id, created_at=None):
+    # Explicit ids stand in for transactions committing out of id order
+    with engine.begin() as conn:
+        conn.execute(insert(OutboxEvent).values(
+            id=event_id,
+            event_type="order_item_created",
+            payload=json.dumps({"n": event_id}),
+            vendor_id=vendor_id,
+            created_at=created_at or datetime.utcnow(),
+            next_attempt_at=datetime.utcnow()
+        ))
+
+
+async def next_ids(stream):
+    events = await asyncio.wait_for(anext(stream), 5)
+    return [event["id"] for event in events]
+
+
+def test_tail_delivers_ids_that_commit_late(client):
+    start = latest_id()
+
+    async def scenario():
+        stream = OutboxTail(poll_interval=0.01, gap_grace=60).listen()
+        pending = asyncio.ensure_future(next_ids(stream))
+        await asyncio.sleep(0.2)
+
+        add_event(start + 2, vendor_id=1)
+        assert await pending == [start + 2]
+
+        # The lower id commits after the higher one was already published
+        add_event(start + 1, vendor_id=1)
+        assert await next_ids(stream) == [start + 1]
+        await stream.aclose()
+
+    client.portal.call(scenario)
+
+
+def test_tail_survives_database_down_at_startup(client, monkeypatch):
+    start = latest_id()
+    real_session = event_stream.AsyncSessionLocal
+    calls = []
+
+    def flaky_session():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("database is down")
+        return real_session()
+
+    monkeypatch.setattr(event_stream, "AsyncSessionLocal", flaky_session)
+
+    async def scenario():
+        stream = OutboxTail(poll_interval=0.01, gap_grace=60).listen()
+        pending = asyncio.ensure_future(next_ids(stream))
+        await asyncio.sleep(0.2)
+
+        add_event(start + 1, vendor_id=1)
+        assert await pending == [start + 1]
+        await stream.aclose()
+
+    client.portal.call(scenario)
+    assert len(calls) > 1
+
+
+def test_resume_replays_the_grace_window(client):
+    start = latest_id()
+    now = datetime.utcnow()
+    add_event(start + 1, vendor_id=7, created_at=now - timedelta(seconds=120))
+    add_event(start + 2, vendor_id=7, created_at=now - timedelta(seconds=5))
+    add_event(start + 3, vendor_id=8, created_at=now - timedelta(seconds=2))
+    add_event(start + 4, vendor_id=7, created_at=now)
+
+    after = client.portal.call(resume_point, start + 4, 7, 30)
+
+    assert after == start + 1
@@ -0,0 +1,65 @@
+import csv
+import io
+
+from app.models.guest import Guest
+
+
+def upload(rows):
+    return {"file": ("guests.csv", "\n".join(rows).encode(), "text/csv")}
+
+
+def test_import_export_and_bulk_delete(client, db, make_user):
+    user, headers = make_user()
+
+    response = client.post("/guest/import", headers=headers, files=upload([
+        "name,contact_number,email",
+        "Asha,9000000001,asha@example.com",
+        "Ravi,9000000002,ravi@example.com",
+        "Asha again,9000000003,ASHA@example.com",
+        "Broken,9000000004,not-an-email",
+    ]))
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["duplicates"]) == (2, 1)
+    assert [error["row"] for error in result["errors"]] == [4]
+
+    # Guests already on the list count as duplicates on a second import
+    again = client.post("/guest/import", headers=headers, files=upload([
+        "name,contact_number,email",
+        "Ravi,9000000002,ravi@example.com",
+    ])).json()
+    assert (again["imported"], again["duplicates"]) == (0, 1)
+
+    export = client.get("/guest/export", headers=headers)
+    assert export.status_code == 200
+    assert export.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(export.text)))
+    assert [row["email"] for row in rows] == ["asha@example.com", "ravi@example.com"]
+
+    ids = [int(row["id"]) for row in rows]
+    response = client.post("/guest/bulk-delete", json={"ids": ids + [987654]}, headers=headers)
+    assert response.json() == {"deleted": 2, "not_found": [987654]}
+    assert db.query(Guest).filter(Guest.user_id == user.id).count() == 0
+
+
+def test_bulk_delete_leaves_other_users_guests(client, db, make_user):
+    owner, _ = make_user()
+    _, headers = make_user()
+    guest = Guest(user_id=owner.id, name="Meera", contact_number="9000000005", email="meera@example.com")
+    db.add(guest)
+    db.commit()
+
+    response = client.post("/guest/bulk-delete", json={"ids": [guest.id]}, headers=headers)
+
+    assert response.json() == {"deleted": 0, "not_found": [guest.id]}
+    db.expire_all()
+    assert db.get(Guest, guest.id) is not None
+
+
+def test_guest_import_requires_a_file_and_the_user_role(client, make_user):
+    _, headers = make_user()
+    _, vendor_headers = make_user("vendor", "catering")
+
+    assert client.post("/guest/import", headers=headers).status_code == 422
+    assert client.post("/guest/import", headers=vendor_headers, files=upload(["name"])).status_code == 403
+    assert client.get("/guest/export", headers=vendor_headers).status_code == 403
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from app.models.cart_item import CartItem
+from app.models.idempotency_key import IdempotencyKey
+from app.utils.idempotency import purge_expired_idempotency_keys
+
+from conftest import CHECKOUT
+
+
+def checkout(client, headers, key, body=CHECKOUT):
+    return client.post("/orders/checkout", json=body, headers={**headers, "Idempotency-Key": key})
+
+
+def test_replay_returns_stored_response_without_side_effects(client, db, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=10)
+    user, headers = make_user()
+    fill_cart(user, (product, 2))
+
+    first = checkout(client, headers, "order-1")
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    # A new cart after the order; a replay must neither check it out nor clear it
+    cart = fill_cart(user, (product, 3))
+
+    replay = checkout(client, headers, "order-1")
+    assert replay.status_code == 200
+    assert replay.json() == first.json()
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+    db.expire_all()
+    db.refresh(product)
+    assert product.stock == 8
+    assert db.query(CartItem).filter(CartItem.cart_id == cart.id).count() == 1
+
+
+def test_key_reused_with_different_body_is_rejected(client, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    user, headers = make_user()
+    fill_cart(user, (make_product(vendor), 1))
+
+    assert checkout(client, headers, "order-2").status_code == 200
+
+    response = checkout(client, headers, "order-2", {**CHECKOUT, "city": "Mumbai"})
+    assert response.status_code == 422
+
+
+def test_failed_checkout_releases_the_key(client, db, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=1)
+    user, headers = make_user()
+    fill_cart(user, (product, 2))
+
+    assert checkout(client, headers, "order-3").status_code == 400
+    assert db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user.id).count() == 0
+
+    product.stock = 5
+    db.commit()
+
+    retry = checkout(client, headers, "order-3")
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+
+
+def test_expired_keys_are_purged(app, db, make_user):
+    user, _ = make_user()
+    now = datetime.utcnow()
+    db.add_all([
+        IdempotencyKey(user_id=user.id, key="old", request_hash="x", expires_at=now - timedelta(minutes=1)),
+        IdempotencyKey(user_id=user.id, key="live", request_hash="x", expires_at=now + timedelta(hours=1))
+    ])
+    db.commit()
+
+    assert purge_expired_idempotency_keys(db) >= 1
+
+    keys = db.query(IdempotencyKey.key).filter(IdempotencyKey.user_id == user.id).all()
+    assert [key for key, in keys] == ["live"]
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import mysql
+
+from app.models.membership import Membership, MembershipStatus
+from app.utils.memberships import extend_memberships
+
+
+def make_membership(db, user, end_date, status=MembershipStatus.expired):
+    membership = Membership(
+        user_id=user.id,
+        start_date=end_date - timedelta(days=180),
+        end_date=end_date,
+        status=status
+    )
+    db.add(membership)
+    db.commit()
+    return membership
+
+
+def test_extension_still_in_the_past_stays_expired(app, db, make_user):
+    user, _ = make_user()
+    membership = make_membership(db, user, date.today() - timedelta(days=90))
+
+    assert extend_memberships(db, [membership.id], 1) == 1
+
+    db.refresh(membership)
+    assert membership.end_date < date.today()
+    assert membership.status == MembershipStatus.expired
+
+
+def test_extension_into_the_future_reactivates(app, db, make_user):
+    user, _ = make_user()
+    membership = make_membership(db, user, date.today() - timedelta(days=10))
+
+    extend_memberships(db, [membership.id], 1)
+
+    db.refresh(membership)
+    assert membership.end_date > date.today()
+    assert membership.status == MembershipStatus.active
+
+
+def test_mysql_assigns_status_before_end_date():
+    # MySQL evaluates SET left to right; status must see the old end_date
+    statements = []
+    fake_db = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")),
+        execute=lambda statement: statements.append(statement) or SimpleNamespace(rowcount=0),
+        commit=lambda: None
+    )
+
+    extend_memberships(fake_db, [1], 6)
+
+    sql = str(statements[0].compile(dialect=mysql.dialect()))
+    assert sql.index("status=") < sql.index("end_date=date_add")
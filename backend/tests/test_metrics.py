@@ -0,0 +1,42 @@
+from app.utils.metrics import metrics
+
+
+def request_count(method, route, status):
+    return metrics.requests.get((method, route, status), 0)
+
+
+def query_total(method, route):
+    histogram = metrics.db_queries.get((method, route))
+    return histogram.total if histogram else 0
+
+
+def test_sync_route_is_labelled_by_template_and_counts_queries(client, make_user):
+    _, headers = make_user("vendor", "catering")
+    route = "/vendor/update-status/{order_item_id}"
+    requests_before = request_count("PUT", route, 404)
+    queries_before = query_total("PUT", route)
+
+    response = client.put("/vendor/update-status/987654?new_status=received", headers=headers)
+
+    assert response.status_code == 404
+    assert request_count("PUT", route, 404) == requests_before + 1
+    # Auth user lookup and the order item lookup, on the sync engine
+    assert query_total("PUT", route) >= queries_before + 2
+
+    text = client.get("/metrics").text
+    assert f'http_requests_total{{method="PUT",route="{route}",status="404"}}' in text
+    assert "/vendor/update-status/987654" not in text
+
+
+def test_async_route_counts_queries(client, make_user):
+    _, headers = make_user()
+    route = "/cart/remove/{item_id}"
+    queries_before = query_total("DELETE", route)
+
+    response = client.delete("/cart/remove/987654", headers=headers)
+
+    assert response.status_code == 404
+    assert request_count("DELETE", route, 404) >= 1
+    # Auth user lookup and the cart lookup, on the async engine
+    assert query_total("DELETE", route) >= queries_before + 2
+    assert 'db_queries_per_request_count{method="DELETE",route="/cart/remove/{item_id}"}' in client.get("/metrics").text
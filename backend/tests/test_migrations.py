@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.migrations import LATEST_VERSION, current_version, migrate
+
+BASELINE = Path(__file__).with_name("baseline_schema.sql")
+
+
+def test_baseline_database_migrates_to_latest(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in BASELINE.read_text().split(";"):
+            if statement.strip():
+                conn.exec_driver_sql(statement)
+
+        # Legacy rows, including the duplicate cart lines that migration 3
+        # merges before adding its unique index
+        conn.execute(text(
+            "INSERT INTO users (id, name, email, passwords, role) VALUES "
+            "(1, 'Vendor', 'v@example.com', 'x', 'vendor'), "
+            "(2, 'Buyer', 'b@example.com', 'x', 'user')"
+        ))
+        conn.execute(text(
+            "INSERT INTO products (id, vendor_id, name, price, stock, status) "
+            "VALUES (1, 1, 'Chair', 10, 5, 'available')"
+        ))
+        conn.execute(text("INSERT INTO carts (id, user_id) VALUES (1, 2)"))
+        conn.execute(text(
+            "INSERT INTO cart_items (cart_id, product_id, quantity) "
+            "VALUES (1, 1, 2), (1, 1, 3)"
+        ))
+        conn.execute(text(
+            "INSERT INTO orders (user_id, total_amount, status, created_at) VALUES "
+            "(2, 10, 'pending', '2024-01-05 10:00:00'), "
+            "(2, 15, 'pending', '2024-01-05 18:00:00'), "
+            "(2, 20, 'pending', '2024-01-06 09:00:00')"
+        ))
+
+    try:
+        assert migrate(engine) == LATEST_VERSION
+
+        with engine.connect() as conn:
+            assert current_version(conn) == LATEST_VERSION
+            assert conn.execute(text(
+                "SELECT quantity FROM cart_items WHERE cart_id = 1 AND product_id = 1"
+            )).scalars().all() == [5]
+            # daily_sales is backfilled by the migration that creates it
+            assert conn.execute(text(
+                "SELECT day, order_count, revenue FROM daily_sales ORDER BY day"
+            )).all() == [("2024-01-05", 2, 25), ("2024-01-06", 1, 20)]
+
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            assert set(table.columns.keys()) <= columns, table.name
+
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= indexes, table.name
+
+        # Running again on an up-to-date database is a no-op
+        assert migrate(engine) == LATEST_VERSION
+    finally:
+        engine.dispose()
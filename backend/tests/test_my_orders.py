@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        # The vendor event stream polls the outbox on the same engine
+        if "outbox_events" not in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def place_orders(db, user, products, count):
+    for _ in range(count):
+        order = Order(user_id=user.id, total_amount=50, status="pending", payment_method="cash")
+        db.add(order)
+        db.flush()
+        for product in products:
+            db.add(OrderItem(order_id=order.id, product_id=product.id, quantity=1, price=10))
+    db.commit()
+
+
+def test_my_orders_query_count_does_not_grow_with_orders(client, db, make_user, make_product):
+    vendor, _ = make_user("vendor", "catering")
+    products = [make_product(vendor) for _ in range(5)]
+
+    small_buyer, small_headers = make_user()
+    big_buyer, big_headers = make_user()
+    place_orders(db, small_buyer, products, 1)
+    place_orders(db, big_buyer, products, 40)
+
+    with count_queries(async_engine.sync_engine) as small:
+        response = client.get("/orders/my-orders?limit=100", headers=small_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    with count_queries(async_engine.sync_engine) as big:
+        response = client.get("/orders/my-orders?limit=100", headers=big_headers)
+    assert response.status_code == 200
+    orders = response.json()
+    assert len(orders) == 40
+    assert all(len(order["items"]) == 5 for order in orders)
+
+    # user lookup, orders, items (IN), products (IN)
+    assert len(big) == len(small) == 4
+
+
+def test_my_orders_pages_newest_first(client, db, make_user, make_product):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor)
+    buyer, headers = make_user()
+    place_orders(db, buyer, [product], 5)
+
+    first = client.get("/orders/my-orders?limit=3", headers=headers).json()
+    rest = client.get(f"/orders/my-orders?limit=3&after_id={first[-1]['order_id']}", headers=headers).json()
+
+    ids = [order["order_id"] for order in first + rest]
+    assert len(ids) == 5
+    assert ids == sorted(ids, reverse=True)
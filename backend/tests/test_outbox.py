@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app import config
+from app.models.outbox_event import OutboxEvent
+from app.utils.outbox import MemorySink, add_events, claim_batch, drain_outbox
+
+
+class FlakySink(MemorySink):
+    # Fails the first `failures` sends, then delivers
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def send(self, event: dict):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("sink unavailable")
+        super().send(event)
+
+
+@pytest.fixture
+def outbox(app, db):
+    # Start from an empty queue: settle whatever earlier tests' checkouts left
+    db.execute(update(OutboxEvent).where(OutboxEvent.delivered_at.is_(None)).values(delivered_at=datetime.utcnow()))
+    db.commit()
+
+    def queue(payload):
+        add_events(db, [("order_placed", payload)])
+        db.commit()
+        return db.query(OutboxEvent).order_by(OutboxEvent.id.desc()).first()
+    return queue
+
+
+def make_due(db, event):
+    # Stands in for waiting out a backoff or lease
+    event.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_successful_send_marks_event_done(db, outbox):
+    event = outbox({"order_id": 1})
+    sink = MemorySink()
+
+    assert drain_outbox(db, sink) == {"claimed": 1, "delivered": 1, "failed": 0}
+    assert sink.events == [{"id": event.id, "type": "order_placed", "payload": {"order_id": 1}}]
+
+    db.refresh(event)
+    assert event.delivered_at is not None
+    assert event.attempts == 1
+
+    make_due(db, event)
+    assert drain_outbox(db, sink)["claimed"] == 0
+
+
+def test_failed_send_is_retried_with_backoff(db, outbox):
+    event = outbox({"order_id": 2})
+    sink = FlakySink(failures=2)
+
+    before = datetime.utcnow()
+    assert drain_outbox(db, sink)["failed"] == 1
+    db.refresh(event)
+    assert event.attempts == 1
+    assert event.last_error == "sink unavailable"
+    assert event.next_attempt_at >= before + timedelta(seconds=config.OUTBOX_RETRY_BASE)
+
+    # Not due again until the backoff passes
+    assert drain_outbox(db, sink)["claimed"] == 0
+
+    make_due(db, event)
+    drain_outbox(db, sink)
+    db.refresh(event)
+    assert event.attempts == 2
+    # The second failure waits twice as long
+    assert event.next_attempt_at >= datetime.utcnow() + timedelta(seconds=2 * config.OUTBOX_RETRY_BASE - 1)
+
+    make_due(db, event)
+    assert drain_outbox(db, sink)["delivered"] == 1
+    assert [e["id"] for e in sink.events] == [event.id]
+
+
+def test_leased_event_is_not_claimed_twice(db, outbox):
+    event = outbox({"order_id": 3})
+
+    assert [row.id for row in claim_batch(db, 10)] == [event.id]
+    assert claim_batch(db, 10) == []
+    assert drain_outbox(db, MemorySink())["claimed"] == 0
+
+
+def test_event_is_redelivered_after_lease_expires(db, outbox):
+    event = outbox({"order_id": 4})
+
+    # A worker claims the event and dies before sending it
+    claim_batch(db, 10)
+
+    make_due(db, event)
+    sink = MemorySink()
+    assert drain_outbox(db, sink)["delivered"] == 1
+    assert [e["id"] for e in sink.events] == [event.id]
@@ -0,0 +1,38 @@
+import asyncio
+
+from app.utils.security import PasswordHasher, password_hasher, verify_password
+
+
+def test_process_pool_uses_spawned_workers():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    hasher.start()
+    try:
+        assert hasher._executor._mp_context.get_start_method() == "spawn"
+
+        hashed = asyncio.run(hasher.hash("secret"))
+        assert verify_password("secret", hashed)
+        assert asyncio.run(hasher.verify("secret", hashed))
+    finally:
+        hasher.shutdown()
+
+
+def test_zero_workers_hash_on_threads():
+    hasher = PasswordHasher(workers=0, max_pending=4)
+    hasher.start()
+
+    assert hasher._executor is None
+    assert verify_password("secret", asyncio.run(hasher.hash("secret")))
+
+
+def test_saturated_pool_turns_signup_and_login_away(client, make_user, monkeypatch):
+    user, _ = make_user()
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+
+    signup = client.post("/auth/signup", json={
+        "name": "Busy", "email": "busy@example.com", "passwords": "secret", "role": "user"
+    })
+    login = client.post("/auth/login", json={"email": user.email, "passwords": "password"})
+
+    for response in (signup, login):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
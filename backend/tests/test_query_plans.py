@@ -0,0 +1,165 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, insert, select, text
+
+from app.database import Base, engine, async_engine
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+from app.models.guest import Guest
+from app.models.membership import Membership
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.user import User
+
+from conftest import auth_headers
+
+# Seeded benchmark dataset; large enough that SQLite's planner, with ANALYZE
+# statistics, prefers a full scan wherever an index is missing.
+VENDORS = 200
+USERS = 2000
+PRODUCTS_PER_VENDOR = 25
+ORDERS = 3000
+CATEGORIES = ["catering", "decoration", "photography", "music", "venue"]
+
+
+@pytest.fixture(scope="module")
+def dataset(app):
+    rng = random.Random(12)
+    with engine.begin() as conn:
+        first_user = conn.execute(select(User.id).order_by(User.id.desc()).limit(1)).scalar() or 0
+
+        conn.execute(insert(User), [
+            {"name": f"plan vendor {i}", "email": f"plan-vendor{i}@example.com", "passwords": "x",
+             "role": "vendor", "category": CATEGORIES[i % len(CATEGORIES)]}
+            for i in range(VENDORS)
+        ] + [
+            {"name": f"plan user {i}", "email": f"plan-user{i}@example.com", "passwords": "x", "role": "user",
+             "category": None}
+            for i in range(USERS)
+        ])
+        vendor_ids = list(range(first_user + 1, first_user + 1 + VENDORS))
+        user_ids = list(range(first_user + 1 + VENDORS, first_user + 1 + VENDORS + USERS))
+
+        conn.execute(insert(Product), [
+            {"vendor_id": vendor_id, "name": f"plan product {vendor_id}-{i}", "description": "seeded",
+             "price": 10 + i, "stock": 100, "status": "available" if i % 5 else "out_of_stock"}
+            for vendor_id in vendor_ids for i in range(PRODUCTS_PER_VENDOR)
+        ])
+        product_ids = conn.execute(
+            select(Product.id).where(Product.vendor_id.in_(vendor_ids))
+        ).scalars().all()
+
+        conn.execute(insert(Order), [
+            {"user_id": rng.choice(user_ids), "total_amount": 100, "status": "pending", "payment_method": "cash"}
+            for _ in range(ORDERS)
+        ])
+        order_ids = conn.execute(
+            select(Order.id).where(Order.user_id.in_(user_ids))
+        ).scalars().all()
+        conn.execute(insert(OrderItem), [
+            {"order_id": order_id, "product_id": rng.choice(product_ids), "quantity": 1,
+             "price": 10, "shipping_status": "received"}
+            for order_id in order_ids for _ in range(3)
+        ])
+
+        conn.execute(insert(Cart), [{"user_id": user_id} for user_id in user_ids])
+        cart_ids = conn.execute(select(Cart.id).where(Cart.user_id.in_(user_ids))).scalars().all()
+        conn.execute(insert(CartItem), [
+            {"cart_id": cart_id, "product_id": product_id, "quantity": 1}
+            for cart_id in cart_ids for product_id in rng.sample(product_ids, 3)
+        ])
+
+        conn.execute(insert(Guest), [
+            {"user_id": user_id, "name": f"guest {i}", "contact_number": "999", "email": f"g{i}@example.com"}
+            for user_id in user_ids for i in range(3)
+        ])
+        today = date.today()
+        conn.execute(insert(Membership), [
+            {"user_id": vendor_id, "duration": "one_year", "start_date": today,
+             "end_date": today + timedelta(days=rng.randint(-300, 300)), "status": "active"}
+            for vendor_id in vendor_ids
+        ])
+
+        conn.execute(text("ANALYZE"))
+
+    return {
+        "vendor_id": vendor_ids[0],
+        "user_id": user_ids[0],
+        "product_id": product_ids[-1]
+    }
+
+
+class CapturedStatements:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self)
+
+
+def full_scans(statement, parameters):
+    # "SCAN <table>" without an index is a full table scan; subqueries and
+    # covering-index scans show up differently
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        plan = [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+    return [
+        detail for detail in plan
+        if detail.startswith("SCAN ") and "USING" not in detail
+        and detail.split()[1] in Base.metadata.tables
+    ]
+
+
+HOT_PATHS = [
+    ("POST", "/cart/add", "user", lambda d: {"json": {"product_id": d["product_id"], "quantity": 1}}),
+    ("GET", "/cart/my-cart", "user", None),
+    ("GET", "/orders/my-orders", "user", None),
+    ("GET", "/guest/my-guests", "user", None),
+    ("GET", "/user/vendors?category=catering", "user", None),
+    ("GET", "/user/products?vendor_id={vendor_id}", "user", None),
+    ("GET", "/vendor/transactions", "vendor", None),
+    ("GET", "/vendor/my-products", "vendor", None),
+    ("GET", "/admin/memberships?status=active&expires_to={today}", "admin", None),
+]
+
+
+@pytest.mark.parametrize("method,path,role,body", HOT_PATHS, ids=[p[1] for p in HOT_PATHS])
+def test_hot_path_queries_use_indexes(client, dataset, make_user, method, path, role, body):
+    if role == "admin":
+        admin, headers = make_user("admin")
+    else:
+        headers = auth_headers(dataset[f"{role}_id"], role)
+
+    url = path.format(vendor_id=dataset["vendor_id"], today=date.today())
+    kwargs = body(dataset) if body else {}
+
+    with CapturedStatements() as captured:
+        response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code == 200, response.text
+    assert captured.statements
+
+    for statement, parameters in captured.statements:
+        assert not full_scans(statement, parameters), statement
+
+
+def test_memberships_by_user_use_index(dataset):
+    statement = str(select(Membership).where(Membership.user_id == 1).compile(engine))
+    assert not full_scans(statement, (dataset["vendor_id"],))
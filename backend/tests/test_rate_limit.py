@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import pytest
+
+import app.database as database
+from app import config
+from app.utils import rate_limit
+from app.utils.rate_limit import MemoryStore, SharedStore, FakeSharedClient
+
+from conftest import CHECKOUT
+
+CHECKOUT_LIMIT = int(config.RATE_LIMIT_CHECKOUT.split("/")[0])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_prune_keeps_other_policies_draining_buckets(clock):
+    store = MemoryStore(max_keys=10, prune_interval=0)
+
+    # Login: 5 per minute, three used
+    for _ in range(3):
+        store.take("login:1.2.3.4", 5, 5 / 60)
+
+    # A burst of fast-refilling cart buckets pushes the store over max_keys
+    clock.now += 1
+    for user in range(20):
+        store.take(f"cart:{user}", 100, 100)
+    clock.now += 1
+    store.take("cart:new", 100, 100)
+
+    assert "login:1.2.3.4" in store._buckets
+    assert "cart:0" not in store._buckets
+
+    # Still only two tokens left
+    assert store.take("login:1.2.3.4", 5, 5 / 60)[0]
+    assert store.take("login:1.2.3.4", 5, 5 / 60)[0]
+    assert not store.take("login:1.2.3.4", 5, 5 / 60)[0]
+
+
+def test_prune_runs_at_most_once_per_interval(clock, monkeypatch):
+    store = MemoryStore(max_keys=10, prune_interval=5)
+    sweeps = []
+    prune = store._prune
+    monkeypatch.setattr(store, "_prune", lambda now: sweeps.append(now) or prune(now))
+
+    for user in range(100):
+        store.take(f"cart:{user}", 10, 1)
+    assert len(sweeps) == 1
+
+    clock.now += 10
+    store.take("cart:late", 10, 1)
+    assert len(sweeps) == 2
+    # Every earlier bucket had refilled
+    assert list(store._buckets) == ["cart:late"]
+
+
+@pytest.fixture(params=["memory", "shared"])
+def limited(request, monkeypatch):
+    # Rate limits on, backed by a fresh store of each kind
+    store = MemoryStore() if request.param == "memory" else SharedStore(FakeSharedClient())
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "store", store)
+    return store
+
+
+@pytest.fixture
+def sessions_opened(monkeypatch):
+    opened = []
+    for name in ("SessionLocal", "AsyncSessionLocal"):
+        real = getattr(database, name)
+        monkeypatch.setattr(database, name, lambda real=real: opened.append(real) or real())
+    return opened
+
+
+def test_throttled_route_returns_429_before_touching_the_database(client, make_user, limited, sessions_opened):
+    _, headers = make_user()
+
+    for _ in range(CHECKOUT_LIMIT):
+        # Empty cart: the limiter lets it through to the handler
+        assert client.post("/orders/checkout", json=CHECKOUT, headers=headers).status_code == 400
+
+    sessions_opened.clear()
+    response = client.post("/orders/checkout", json=CHECKOUT, headers=headers)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert sessions_opened == []
+
+
+def test_limit_is_per_key(client, make_user, limited):
+    _, headers = make_user()
+    _, other_headers = make_user()
+
+    for _ in range(CHECKOUT_LIMIT):
+        client.post("/orders/checkout", json=CHECKOUT, headers=headers)
+    assert client.post("/orders/checkout", json=CHECKOUT, headers=headers).status_code == 429
+
+    # Another user, and another policy for the same user, have their own buckets
+    assert client.post("/orders/checkout", json=CHECKOUT, headers=other_headers).status_code == 400
+    response = client.post("/cart/add", json={"product_id": 0, "quantity": 1}, headers=headers)
+    assert response.status_code == 404
+
+
+def test_shared_store_refills_over_time(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: clock.now))
+    store = SharedStore(FakeSharedClient())
+
+    assert store.take("login:ip", 2, 1)[0]
+    assert store.take("login:ip", 2, 1)[0]
+    allowed, retry_after = store.take("login:ip", 2, 1)
+    assert not allowed
+    assert retry_after == pytest.approx(1)
+
+    clock.now += 1
+    assert store.take("login:ip", 2, 1)[0]
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from app.models.cart_item import CartItem
+from app.models.stock_reservation import StockReservation
+from app.utils.reservations import release_expired_reservations
+
+from conftest import CHECKOUT
+
+
+def add(client, headers, product, quantity):
+    return client.post("/cart/add", json={"product_id": product.id, "quantity": quantity}, headers=headers)
+
+
+def test_add_and_update_are_limited_to_available_to_promise(client, db, make_user, make_product):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=5)
+    _, other_headers = make_user()
+    user, headers = make_user()
+
+    assert add(client, other_headers, product, 4).status_code == 200
+
+    response = add(client, headers, product, 2)
+    assert response.status_code == 400
+    assert response.json()["detail"].endswith("Available: 1")
+
+    assert add(client, headers, product, 1).status_code == 200
+
+    item = db.query(CartItem).filter(CartItem.product_id == product.id).order_by(CartItem.id.desc()).first()
+    response = client.put(
+        "/cart/update-quantity",
+        json={"cart_item_id": item.id, "quantity": 2},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_checkout_uses_own_hold_but_not_others(client, db, make_user, make_product, fill_cart):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=5)
+    _, holder_headers = make_user()
+    assert add(client, holder_headers, product, 4).status_code == 200
+
+    # No hold of its own: only 1 unit is free of the other cart's hold
+    user, headers = make_user()
+    fill_cart(user, (product, 2))
+    response = client.post("/orders/checkout", json=CHECKOUT, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"].endswith("Available: 1")
+
+    # The holder checks out against its own reservation
+    assert client.post("/orders/checkout", json=CHECKOUT, headers=holder_headers).status_code == 200
+
+    db.refresh(product)
+    assert product.stock == 1
+    assert db.query(StockReservation).filter(StockReservation.product_id == product.id).count() == 0
+
+
+def test_sweeper_releases_expired_holds(client, db, make_user, make_product):
+    vendor, _ = make_user("vendor", "catering")
+    product = make_product(vendor, stock=3)
+    _, holder_headers = make_user()
+    _, headers = make_user()
+    assert add(client, holder_headers, product, 3).status_code == 200
+    assert add(client, headers, product, 1).status_code == 400
+
+    reservation = db.query(StockReservation).filter(StockReservation.product_id == product.id).one()
+    reservation.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert release_expired_reservations(db) >= 1
+    assert db.query(StockReservation).filter(StockReservation.product_id == product.id).count() == 0
+    assert add(client, headers, product, 1).status_code == 200
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import CHECKOUT
+
+# Wide enough to cover the database's current_date whatever the local timezone
+WINDOW = {"from": str(date.today() - timedelta(days=1)), "to": str(date.today() + timedelta(days=1))}
+
+
+def test_checkout_updates_summary_and_analytics(client, make_user, make_product, fill_cart):
+    _, admin_headers = make_user("admin")
+    vendor, _ = make_user("vendor", "catering")
+    user, headers = make_user()
+    fill_cart(user, (make_product(vendor, price=10), 3))
+
+    def totals():
+        summary = client.get("/admin/sales-summary", headers=admin_headers)
+        analytics = client.get("/admin/sales-analytics", params={**WINDOW, "bucket": "month"}, headers=admin_headers)
+        assert summary.status_code == 200 and analytics.status_code == 200
+        buckets = analytics.json()["data"]
+        return summary.json(), sum(b["order_count"] for b in buckets), sum(b["revenue"] for b in buckets)
+
+    before, count_before, revenue_before = totals()
+    assert client.post("/orders/checkout", json=CHECKOUT, headers=headers).status_code == 200
+    after, count_after, revenue_after = totals()
+
+    assert after["total_orders"] == before["total_orders"] + 1
+    assert after["total_revenue"] == pytest.approx(before["total_revenue"] + 30)
+    assert count_after == count_before + 1
+    assert revenue_after == pytest.approx(revenue_before + 30)
+
+
+def test_sales_endpoints_reject_bad_ranges_and_non_admins(client, make_user):
+    _, admin_headers = make_user("admin")
+    _, user_headers = make_user()
+
+    response = client.get(
+        "/admin/sales-analytics",
+        params={"from": "2024-02-01", "to": "2024-01-01"},
+        headers=admin_headers
+    )
+    assert response.status_code == 400
+
+    assert client.get("/admin/sales-summary", headers=user_headers).status_code == 403
@@ -0,0 +1,46 @@
+import base64
+import json
+
+import pytest
+
+
+def raw_cursor(value, last_id):
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode()).decode()
+
+
+def test_price_cursor_pages_through_results(client, make_user, make_product):
+    vendor, _ = make_user("vendor", "decoration")
+    for price in (30, 10, 20):
+        make_product(vendor, price=price, name=f"Paper lantern {price}")
+    _, headers = make_user()
+
+    prices = []
+    params = {"q": "lantern", "sort": "price_asc", "limit": 1}
+    for _ in range(3):
+        page = client.get("/user/products/search", params=params, headers=headers).json()
+        prices += [item["price"] for item in page["items"]]
+        params["cursor"] = page["next_cursor"]
+
+    assert prices == [10.0, 20.0, 30.0]
+
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("price_asc", raw_cursor("abc", 1)),
+    ("price_desc", raw_cursor(None, 1)),
+    ("price_asc", raw_cursor(12.5, 1)),
+    ("price_asc", raw_cursor("NaN", 1)),
+    ("relevance", raw_cursor("abc", 1)),
+    ("newest", raw_cursor(None, "x")),
+    ("newest", "not-base64!"),
+])
+def test_tampered_cursor_is_rejected(client, make_user, sort, cursor):
+    _, headers = make_user()
+
+    response = client.get(
+        "/user/products/search",
+        params={"q": "lantern", "sort": sort, "cursor": cursor},
+        headers=headers
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
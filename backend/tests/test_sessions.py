@@ -0,0 +1,41 @@
+from sqlalchemy import event
+
+import app.database as database
+from app.database import engine
+
+
+def test_auth_and_route_share_one_session_and_one_connection(client, make_user, monkeypatch):
+    vendor, headers = make_user("vendor", "catering")
+
+    sessions = []
+    real_session_local = database.SessionLocal
+
+    def counting_session_local():
+        session = real_session_local()
+        sessions.append(session)
+        return session
+
+    checked_out = {"now": 0, "peak": 0}
+
+    def on_checkout(*args):
+        checked_out["now"] += 1
+        checked_out["peak"] = max(checked_out["peak"], checked_out["now"])
+
+    def on_checkin(*args):
+        checked_out["now"] -= 1
+
+    monkeypatch.setattr(database, "SessionLocal", counting_session_local)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    try:
+        response = client.get("/vendor/my-products", headers=headers)
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+        event.remove(engine, "checkin", on_checkin)
+
+    assert response.status_code == 200
+    # get_current_user, require_role and the handler all use one session...
+    assert len(sessions) == 1
+    # ...which never holds more than one pooled connection at a time
+    assert checked_out["peak"] == 1
+    assert checked_out["now"] == 0
@@ -0,0 +1,44 @@
+from test_my_orders import place_orders
+
+
+def test_summary_covers_every_page(client, db, make_user, make_product):
+    vendor, headers = make_user("vendor", "catering")
+    other_vendor, _ = make_user("vendor", "catering")
+    products = [make_product(vendor), make_product(vendor)]
+    buyer, _ = make_user()
+    place_orders(db, buyer, products, 40)
+    place_orders(db, buyer, [make_product(other_vendor)], 5)
+
+    page = client.get("/vendor/transactions", headers=headers)
+    assert page.status_code == 200
+    assert len(page.json()) == 50
+
+    summary = client.get("/vendor/transactions/summary", headers=headers)
+    assert summary.status_code == 200
+    assert summary.json() == {"sales": 80, "revenue": 800.0}
+
+
+def test_transactions_page_across_boundaries(client, db, make_user, make_product):
+    vendor, headers = make_user("vendor", "catering")
+    buyer, _ = make_user()
+    place_orders(db, buyer, [make_product(vendor), make_product(vendor)], 10)
+
+    seen = []
+    params = {"limit": 7}
+    while True:
+        page = client.get("/vendor/transactions", params=params, headers=headers).json()
+        seen += [row["order_item_id"] for row in page]
+        if len(page) < 7:
+            break
+        params["after_id"] = page[-1]["order_item_id"]
+
+    assert len(seen) == 20
+    assert seen == sorted(set(seen), reverse=True)
+
+
+def test_summary_without_sales(client, make_user):
+    _, headers = make_user("vendor", "catering")
+
+    response = client.get("/vendor/transactions/summary", headers=headers)
+
+    assert response.json() == {"sales": 0, "revenue": 0.0}
@@ -2,29 +2,53 @@ import React, { useState, useEffect } from 'react';
 import api from '../../services/api';
 import { CalendarDays, Plus, Clock, XCircle, User as UserIcon, Calendar, CheckCircle } from 'lucide-react';
 
+const PAGE_SIZE = 100;
+
+// /admin/memberships is paged and ordered by (end_date, id): soonest to expire first
+const fetchMembershipPage = (after = null) => {
+    const params = { limit: PAGE_SIZE };
+    if (after) {
+        params.after_end_date = after.end_date;
+        params.after_id = after.id;
+    }
+    return api.get('/admin/memberships', { params });
+};
+
 const AdminMemberships = () => {
     const [memberships, setMemberships] = useState([]);
     const [users, setUsers] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [hasMore, setHasMore] = useState(false);
     const [formData, setFormData] = useState({ user_id: '', duration: '6m' });
 
     const fetchData = async () => {
         try {
             const [mRes, uRes] = await Promise.all([
-                api.get('/admin/users'), // To list users for selection
-                api.get('/admin/vendors') // We need vendors for memberships usually
+                fetchMembershipPage(),
+                api.get('/admin/vendors') // Memberships are issued to vendors
             ]);
-            // Assuming GET /admin/memberships exists or we list all vendors/users and check membership status
-            // Wait, let me check backend for membership listing
-            const mList = await api.get('/admin/memberships'); // I should check if this exists
-            setMemberships(mList.data);
-            setUsers([...uRes.data]); // Focus on vendors for memberships
+            setMemberships(mRes.data);
+            setHasMore(mRes.data.length === PAGE_SIZE);
+            setUsers([...uRes.data]);
         } catch (err) {
             console.error('Failed to fetch memberships', err);
         }
         setLoading(false);
     };
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const res = await fetchMembershipPage(memberships[memberships.length - 1]);
+            setMemberships(prev => [...prev, ...res.data]);
+            setHasMore(res.data.length === PAGE_SIZE);
+        } catch (err) {
+            console.error('Failed to fetch memberships', err);
+        }
+        setLoadingMore(false);
+    };
+
     useEffect(() => {
         fetchData();
     }, []);
@@ -123,6 +147,13 @@ const AdminMemberships = () => {
                         </tbody>
                     </table>
                 </div>
+                {hasMore && (
+                    <div style={{ textAlign: 'center', marginTop: '24px' }}>
+                        <button className="btn btn-outline" onClick={loadMore} disabled={loadingMore}>
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
 
             <div>